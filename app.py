@@ -15,7 +15,7 @@ UI INPUTS AND USAGE:
 
 3. PRODUCT CATEGORIZATION LIST (from UI large textbox)
    → User can edit the product list used in AI prompts
-   → Injected into email_processing.PROMPT_TEMPLATE using regex replacement
+   → Substituted into the prompts.USER_PROMPT_TEMPLATE product list slot
    → Allows customization without editing code
 
 4. SKIP CHECKPOINT (from UI checkbox)
@@ -33,36 +33,48 @@ WINDOWS COM THREADING:
 All UI inputs are actively used and affect the workflow execution.
 """
 import gradio as gr
+import asyncio
 import os
 import sys
+import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
-import pandas as pd
-import re
+
+if sys.platform == 'win32':
+    import pythoncom
 
 # Import workflow components
 from config_loader import get_config
-from config import OUTPUT_DIR, OUTPUT_FILENAME
-from extractor import EmailProcessor as EmailExtractor
+from config import OUTPUT_DIR, OUTPUT_FILENAME, FAST_IO
+from extractor import EmailProcessor
+from email_processing import AIProcessor, attach_parsed_columns
+from prompts import PRODUCT_LIST
 from utils.date_utils import parse_date
+from utils.io_utils import (
+    compact_dtypes, read_table, resolve_fast_io_path, write_excel, write_parquet_twin
+)
 
 # Default product list
-DEFAULT_PRODUCT_LIST = """Agitadores, Aireadores, Almacenamiento, Arqueta, Asesoramiento, Biodigestor, Biodiscos, Bombas, Canal Parshall, Cavitador CAF, Clarificadores, Colector, Compresor, Compuerta, Compuertas, Contenedor, Cuadro electrico, Cucharas bivalva, Decantador centrífugo, Decantador lamelar, Decantador SBR, Desarenador, Desarenador cicloidal, Desarenador desengrasador, Desbaste, Deshidratación purín, Deshidratador centrifugo, Deshidratador filtro pensa, Desinfección por cloración, Desnatador, Difusores, Equipo para sistema de agua desalinizada, Equipos electromecánicos, Equipos pretratamiento y espesamiento, Estudios, Evaporadaror, Fabricación planta tratamiento, Filtración, Filtro carbon activado, Filtro prensa, Floculador, Floculante, Generador de microburbuja, Generador de Ozono, Instrumentación, Inyector, Mantenimiento, Membranas MBR, Mezclador, Osmosis inversa, Pasamuro, Planta de biogás, Planta de pretratamiento, Planta de pretratamiento compacta, Planta de tratamiento, Planta pilloto, Planta poli, Planta tratamiento compacta, PLC de control, Polipastos, Polymer feed pump, Pozo de bombeos, pressure booster pump, Reja de desbaste, Reja desbaste, Rental and, Repuestos Tornillo deshidratador de lodo, Sacor filtrantes, Separador de grasas, Separador de hidrocarburos, Separador solido liquido, Separadores de lodos ciclónicos, Silo decantador, Sinfin, Sistema CAF, Sistema coagulacion floculación, Sistema DAF, sistema de extracción de lodos, Sistema de medición continua, Sistema de neutralización de gas clorado, Sistema de ultrafiltración, Sistema desalinización, Sistema desodorización, Sistema electroquimico, Sistema FCM, Sistema llenado botellas, Sistema lodos activados, Sistema MBBR, Sistema MBR, Sistema SBR, Soplante, Tamiz compactador, Tamiz de aliviadero, Tamiz rotativo, Tanque de mazcla, Tanque de tormentas, Tolva, Tornillo deshidratador de lodo, Tratamiento biológico, Tratamiento reactores secuenciales, Tratamiento terciario, Tubos, Valvulas, Varios"""
+DEFAULT_PRODUCT_LIST = PRODUCT_LIST
+
+
+def normalize_product_list(product_list):
+    """Strip whitespace and blank entries from a comma-separated product list, keeping its order."""
+    return ", ".join(item.strip() for item in product_list.split(',') if item.strip())
 
 
 def load_config():
     """Load configuration and return key settings."""
     try:
         config = get_config()
-        extraction_config = config.get_section('extraction')
-        processing_config = config.get_section('processing')
+        extraction = config.extraction
 
         return {
-            'email': extraction_config.get('target_account_email', 'Not configured'),
-            'folder': extraction_config.get('target_folder_name', 'Not configured'),
-            'subfolder': extraction_config.get('target_subfolder_name', ''),
-            'model': processing_config.get('model', 'openai/gpt-4o-mini'),
-            'output_dir': extraction_config.get('output_dir', 'outputs')
+            'email': extraction.target_account_email,
+            'folder': extraction.target_folder_name,
+            'subfolder': extraction.target_subfolder_name,
+            'model': config.processing.model,
+            'output_dir': extraction.output_dir
         }
     except Exception as e:
         return {'error': str(e)}
@@ -83,9 +95,7 @@ def run_extraction(start_date, end_date, output_name, progress=gr.Progress()):
     """
     try:
         # Initialize COM for Windows threading (required for Outlook automation in Gradio threads)
-        import sys
         if sys.platform == 'win32':
-            import pythoncom
             pythoncom.CoInitialize()
 
         progress(0, desc="Starting extraction...")
@@ -107,10 +117,6 @@ def run_extraction(start_date, end_date, output_name, progress=gr.Progress()):
 
         progress(0.3, desc="Extracting emails from Outlook...")
 
-        # Import and create extractor with custom filenames
-        from extractor import EmailProcessor
-        import config
-
         # Initialize processor with custom filenames (if provided)
         if output_name:
             processor = EmailProcessor(
@@ -122,21 +128,24 @@ def run_extraction(start_date, end_date, output_name, progress=gr.Progress()):
             processor = EmailProcessor()
 
         # Pass date filters from UI to extractor
-        processor.process_folder(start_dt, end_dt)
+        success, extraction_stats, output_path, _ = processor.process_folder(start_dt, end_dt)
 
         progress(1.0, desc="Extraction complete!")
 
-        # Get statistics from extracted file
-        output_path = os.path.join(config.OUTPUT_DIR, output_file)
-        if os.path.exists(output_path):
-            df = pd.read_excel(output_path)
-            stats = f"✅ Extracted {len(df)} emails\n📁 Saved to: {output_path}"
-            return stats, output_path, len(df)
-        else:
+        if not success:
+            return "❌ Error during extraction. Check that Outlook is open and the folders exist.", None, None
+
+        # The extractor already knows how many emails it wrote: no re-read needed
+        count = extraction_stats.extracted_count
+        if count == 0:
+            return "⚠️ Extraction completed but no emails were found\n⚠️ No emails to process", None, 0
+        if not os.path.exists(output_path):
             return "⚠️ Extraction completed but no output file found", None, 0
 
+        stats = f"✅ Extracted {count} emails\n📁 Saved to: {output_path}"
+        return stats, output_path, count
+
     except Exception as e:
-        import traceback
         error_details = traceback.format_exc()
         return f"❌ Error during extraction: {str(e)}\n\nDetails:\n{error_details}", None, None
     finally:
@@ -145,10 +154,13 @@ def run_extraction(start_date, end_date, output_name, progress=gr.Progress()):
             pythoncom.CoUninitialize()
 
 
-def run_processing(extracted_file, output_name, product_list, progress=gr.Progress()):
+async def run_processing(extracted_file, output_name, product_list, progress=gr.Progress()):
     """
     Run AI processing phase with custom product list from UI.
 
+    Async so the Gradio worker isn't held while waiting on the API; blocking
+    file I/O is pushed to worker threads.
+
     Args:
         extracted_file: Path to extracted emails file
         output_name: Custom name for output file
@@ -170,48 +182,51 @@ def run_processing(extracted_file, output_name, product_list, progress=gr.Progre
         elif not os.path.exists(extracted_file):
              return "❌ Error: No extracted emails file found. Run extraction first.", None
 
-        progress(0, desc="Loading extracted emails...")
-
-        # Load emails
-        df = pd.read_excel(extracted_file)
-        total = len(df)
-
-        if total == 0:
-            return "⚠️ No emails to process", None
+        progress(0.1, desc=f"Preparing AI analysis with custom product list...")
 
-        progress(0.2, desc=f"Preparing AI analysis with custom product list...")
-
-        # Import email processing module
-        from email_processing import AIProcessor
-        
         # Initialize processor
         processor = AIProcessor()
 
         # UI INPUT 3: Apply custom product_list from UI to AI prompt
         if product_list.strip():
-            processor.update_product_list(product_list)
+            processor.update_product_list(normalize_product_list(product_list))
 
-        progress(0.3, desc=f"Processing {total} emails with AI...")
+        # UI INPUT 2: Use custom output_name from UI for processed file
+        output_file = f"{output_name}_processed.xlsx" if output_name else "emails_processed.xlsx"
+        output_path = os.path.join('outputs', output_file)
 
-        # Run async processing
-        import asyncio
-        results = asyncio.run(processor.process_all_emails(df))
+        def report_chunk(start, end, total):
+            progress(0.2 + 0.7 * start / total, desc=f"Processing emails {start + 1}-{end} with AI...")
 
-        progress(0.8, desc="Parsing AI responses...")
+        try:
+            # Read the input (from the Feather sidecar when it is up to date)
+            input_path = resolve_fast_io_path(extracted_file) if FAST_IO else extracted_file
+            df = compact_dtypes(await asyncio.to_thread(read_table, input_path))
+            if len(df) == 0:
+                return "⚠️ No emails to process", None
 
-        # Parse results
-        parsed = [processor.parse_json(json_str) for json_str in results]
-        df_parsed = pd.DataFrame(parsed)
+            # Same chunk pipeline as the CLI, so interrupted runs resume from
+            # the chunk checkpoints
+            checkpoint = processor.checkpoint_for(
+                output_path, os.path.abspath(extracted_file), os.path.getmtime(extracted_file)
+            )
+            columns = await processor.process_in_chunks(df, checkpoint, on_chunk=report_chunk)
+        finally:
+            await processor.aclose()
 
-        # Merge with original data
-        df_final = pd.concat([df.reset_index(drop=True), df_parsed], axis=1)
+        # Attach the AI columns (no intermediate DataFrame + concat copy)
+        df_final = attach_parsed_columns(df, columns)
 
-        # UI INPUT 2: Use custom output_name from UI for processed file
-        output_file = f"{output_name}_processed.xlsx" if output_name else "emails_processed.xlsx"
-        output_path = os.path.join('outputs', output_file)
+        progress(0.9, desc="Saving results...")
 
         os.makedirs('outputs', exist_ok=True)
-        df_final.to_excel(output_path, index=False)
+        await asyncio.to_thread(write_excel, df_final, output_path)
+        if FAST_IO:
+            # Columnar twin so downstream consumers can skip Excel entirely
+            await asyncio.to_thread(write_parquet_twin, df_final, output_path)
+
+        if checkpoint:
+            checkpoint.clear()
 
         progress(1.0, desc="Processing complete!")
 
@@ -219,13 +234,12 @@ def run_processing(extracted_file, output_name, product_list, progress=gr.Progre
         return stats, output_path
 
     except Exception as e:
-        import traceback
         error_details = traceback.format_exc()
         return f"❌ Error during processing: {str(e)}\n\nDetails:\n{error_details}", None
 
 
-def run_full_workflow(start_date, end_date, output_name, product_list,
-                     skip_checkpoint, progress=gr.Progress()):
+async def run_full_workflow(start_date, end_date, output_name, product_list,
+                           skip_checkpoint, progress=gr.Progress()):
     """
     Run complete workflow: extraction + processing.
 
@@ -242,10 +256,12 @@ def run_full_workflow(start_date, end_date, output_name, product_list,
     """
     # Step 1: Extraction
     progress(0, desc="Phase 1: Extracting emails...")
-    extract_status, extracted_file, count = run_extraction(
-        start_date, end_date, output_name, progress
+    # Extraction is blocking COM work: run it in a worker thread
+    extract_status, extracted_file, _ = await asyncio.to_thread(
+        run_extraction, start_date, end_date, output_name, progress
     )
 
+    # Also covers an empty extraction (run_extraction returns no file)
     if not extracted_file:
         return extract_status, None, None
 
@@ -257,7 +273,7 @@ def run_full_workflow(start_date, end_date, output_name, product_list,
 
     # Step 2: Processing (auto-process when skip_checkpoint is True)
     progress(0.5, desc="Phase 2: Processing with AI...")
-    process_status, processed_file = run_processing(
+    process_status, processed_file = await run_processing(
         extracted_file, output_name, product_list, progress
     )
 
@@ -9,19 +9,25 @@ from config_loader import get_config
 
 # Load configuration
 _config = get_config()
-_extraction_config = _config.get_section('extraction')
+_extraction = _config.extraction
 
 # === OUTLOOK SETTINGS ===
-TARGET_ACCOUNT_EMAIL = _extraction_config.get('target_account_email', 'your_email@company.com')
-INBOX_FOLDER_NAME = _extraction_config.get('inbox_folder_name', 'Inbox')
-TARGET_FOLDER_NAME = _extraction_config.get('target_folder_name', 'YourFolder')
-TARGET_SUBFOLDER_NAME = _extraction_config.get('target_subfolder_name', '')
+TARGET_ACCOUNT_EMAIL = _extraction.target_account_email
+INBOX_FOLDER_NAME = _extraction.inbox_folder_name
+TARGET_FOLDER_NAME = _extraction.target_folder_name
+TARGET_SUBFOLDER_NAME = _extraction.target_subfolder_name
 
 # === OUTPUT SETTINGS ===
-OUTPUT_DIR = _extraction_config.get('output_dir', 'outputs')
-OUTPUT_FILENAME = _extraction_config.get('output_filename', 'emails.xlsx')
-EXCLUDED_FILENAME = _extraction_config.get('excluded_filename', 'emails_excluded.xlsx')
-ERRORS_FILENAME = _extraction_config.get('errors_filename', 'emails_errors.xlsx')
+OUTPUT_DIR = _extraction.output_dir
+OUTPUT_FILENAME = _extraction.output_filename
+EXCLUDED_FILENAME = _extraction.excluded_filename
+ERRORS_FILENAME = _extraction.errors_filename
 
 # === PROCESSING SETTINGS ===
-PROGRESS_INTERVAL = _extraction_config.get('progress_interval', 10)
+PROGRESS_INTERVAL = _extraction.progress_interval
+# Outlook sessions used to extract a date range in parallel (1 = serial)
+PARALLEL_WORKERS = _extraction.parallel_workers
+
+# === I/O SETTINGS ===
+# Write a Feather sidecar next to the Excel output for faster handoff to processing
+FAST_IO = _config.processing.fast_io
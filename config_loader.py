@@ -3,12 +3,65 @@ Centralized configuration loader for the email workflow.
 Loads settings from workflow_config.yaml and environment variables from .env file.
 """
 import os
+import sys
 import yaml
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 
+def _from_section(cls, section: Dict[str, Any]):
+    """Build a settings dataclass from a YAML section, ignoring unknown keys."""
+    known = {f.name for f in fields(cls)}
+    return cls(**{key: value for key, value in section.items() if key in known})
+
+
+# dataclass(slots=...) needs Python 3.10; older versions get regular classes
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class ExtractionSettings:
+    """Typed, read-only view of the 'extraction' section."""
+    target_account_email: str = "your_email@company.com"
+    inbox_folder_name: str = "Inbox"
+    target_folder_name: str = "YourFolder"
+    target_subfolder_name: str = ""
+    output_dir: str = "outputs"
+    output_filename: str = "emails.xlsx"
+    excluded_filename: str = "emails_excluded.xlsx"
+    errors_filename: str = "emails_errors.xlsx"
+    progress_interval: int = 10
+    parallel_workers: int = 1
+
+
+@dataclass(frozen=True, **_SLOTS)
+class ProcessingSettings:
+    """Typed, read-only view of the 'processing' section."""
+    input_file: str = "outputs/emails.xlsx"
+    output_file: str = "outputs/emails_processed.xlsx"
+    fast_io: bool = True
+    chunk_size: int = 2000
+    checkpoint: bool = True
+    use_openrouter: bool = True
+    model: str = "openai/gpt-4o-mini"
+    max_tokens: int = 1000
+    temperature: float = 0
+    concurrency: int = 10
+    emails_per_request: int = 1
+    use_tool_schema: bool = False
+    local_category_matching: bool = False
+    max_body_chars: int = 0
+    strip_quoted_replies: bool = False
+    max_rpm: float = 500
+    retry_attempts: int = 3
+    retry_min_wait: float = 2
+    retry_max_wait: float = 20
+    response_cache: bool = True
+    response_cache_path: str = "outputs/.llm_cache.sqlite"
+
+
 class ConfigLoader:
     """Loads and manages configuration from YAML and .env files."""
 
@@ -47,7 +100,16 @@ class ConfigLoader:
             )
 
         with open(self.config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+            self.config = yaml.safe_load(f) or {}
+
+        # Empty sections load as None; normalize them once here
+        for section, values in self.config.items():
+            if values is None:
+                self.config[section] = {}
+
+        # Freeze the hot sections into typed settings (plain attribute access)
+        self.extraction = _from_section(ExtractionSettings, self.get_section('extraction'))
+        self.processing = _from_section(ProcessingSettings, self.get_section('processing'))
 
         print(f"✅ Loaded configuration from {self.config_path}")
 
@@ -124,7 +186,7 @@ class ConfigLoader:
             True if OpenRouter should be used, False for direct OpenAI
         """
         # Check config preference
-        use_openrouter = self.get('processing', 'use_openrouter', True)
+        use_openrouter = self.processing.use_openrouter
 
         # If config says use OpenRouter, check if key is available
         if use_openrouter:
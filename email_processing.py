@@ -1,18 +1,168 @@
 import json
 import logging
 import asyncio
-import pandas as pd
-import re
 import time
 import os
-from openai import AsyncOpenAI
-from tenacity import retry, wait_exponential, stop_after_attempt
+from collections import Counter
+import httpx
+from openai import (
+    AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
+)
+from tenacity import retry, retry_if_exception_type, wait_exponential, stop_after_attempt
+from aiolimiter import AsyncLimiter
 from config_loader import get_config
-from prompts import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from utils.io_utils import (
+    compact_dtypes, frame_fingerprint, read_table, resolve_fast_io_path, write_excel,
+    write_parquet_twin
+)
+from utils.checkpoint import ChunkCheckpoint
+from utils.json_utils import json_dumps, json_loads
+from utils.response_cache import ResponseCache, cache_key
+from utils.text_utils import strip_quoted_reply
+from utils.category_matcher import get_category_matcher, get_default_category_matcher
+from prompts import (
+    SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, PRODUCT_LIST, MULTI_EMAIL_INSTRUCTIONS,
+    ANALYSIS_TOOL_NAME, TOOL_PRODUCT_LIST_NOTE, LOCAL_CATEGORY_NOTE,
+    build_analysis_tool, split_product_list
+)
+
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Prompt template split around the product list, so swapping the list is a
+# plain concatenation. The template is never passed through str.format, so
+# its escaped JSON braces are unescaped here once.
+_PROMPT_PREFIX, _PROMPT_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}")
+    for part in USER_PROMPT_TEMPLATE.split("{PRODUCT_LIST}")
+)
+
+# Email columns sent to the AI, in prompt order
+EMAIL_FIELDS = ("From_Name", "From_Email", "To", "Date", "Subject", "Body")
+
+# HTTP/2 lets all in-flight requests share a few connections; it needs the
+# optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# API errors worth retrying (APITimeoutError is an APIConnectionError); bad
+# requests, auth errors and the like fail the same way on every attempt
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+# Placeholder answers for requests that produced no usable response
+_API_ERROR_JSON = json_dumps({"record_id": "error", "company_info": {"name": "API Error"}})
+_EMPTY_RESPONSE_JSON = json_dumps({"record_id": "error", "company_info": {"name": "Empty response"}})
+
+# Columns produced by AIProcessor.parse_json, in output order
+PARSED_FIELDS = (
+    "record_id",
+    "company_name",
+    "company_website",
+    "company_country",
+    "email_category",
+    "product_category",
+    "equipment_requested",
+    "technical_specifications",
+    "subject_body_correlation",
+)
+
+def new_parsed_columns(n):
+    """Preallocate one list of n slots per PARSED_FIELDS column."""
+    return {field: [None] * n for field in PARSED_FIELDS}
+
+
+def store_parsed(columns, idx, parsed):
+    """Write one parse_json result into slot idx of the column lists."""
+    for field, values in columns.items():
+        values[idx] = parsed.get(field)
+
+
+def attach_parsed_columns(df, columns):
+    """
+    Add the parsed AI columns to df in place.
+
+    The lists are assigned positionally, so df keeps its index and no
+    intermediate DataFrame or concat copy is made.
+    """
+    for field, values in columns.items():
+        df[field] = values
+    return df
+
+
+# Control characters that are invalid inside JSON strings (tab, LF and CR are
+# kept: they are valid whitespace between tokens)
+_CTRL_TABLE = dict.fromkeys([*range(0, 9), 11, 12, *range(14, 32)], None)
+
+
+def _load_response(json_text):
+    """Decode a response into its JSON object (raises on invalid JSON)."""
+    try:
+        return json_loads(json_text)
+    except json.JSONDecodeError:
+        # Models occasionally emit raw control characters; strip and retry
+        return json_loads(json_text.translate(_CTRL_TABLE))
+
+
+def is_valid_response(json_text):
+    """Whether a response decodes to a JSON object that parse_json can read."""
+    if not json_text:
+        return False
+    try:
+        return isinstance(_load_response(json_text), dict)
+    except Exception:
+        return False
+
+
+def parse_json(json_text):
+    """Parse JSON response from AI API."""
+    # Handle empty or None responses
+    if not json_text:
+        return _get_empty_parsed_result("Empty or None response")
+
+    try:
+        data = _load_response(json_text)
+
+        # Ensure all fields exist with defaults
+        company_info = data.get("company_info", {})
+
+        return {
+            "record_id": data.get("record_id", "Not found"),
+            "company_name": company_info.get("name", "Not specified"),
+            "company_website": company_info.get("website", "Not mentioned"),
+            "company_country": company_info.get("country", "Not specified"),
+            "email_category": data.get("email_category", "Not specified"),
+            "product_category": data.get("product_category", "Not specified"),
+            "equipment_requested": data.get("equipment_requested", "Not specified"),
+            "technical_specifications": data.get("technical_specifications", "None specified"),
+            "subject_body_correlation": data.get("subject_body_correlation", "Not specified")
+        }
+    except json.JSONDecodeError as e:
+        logger.warning("⚠️  JSON parse error: %s", e)
+        return _get_empty_parsed_result("JSON parse error")
+    except Exception as e:
+        logger.error("⚠️  Unexpected error parsing JSON: %s", e)
+        return _get_empty_parsed_result("Unexpected error")
+
+
+def _get_empty_parsed_result(reason):
+    """Return a dict with default values for failed parsing."""
+    return {
+        "record_id": reason,
+        "company_name": "Error",
+        "company_website": "Error",
+        "company_country": "Error",
+        "email_category": "Error",
+        "product_category": "Error",
+        "equipment_requested": "Error",
+        "technical_specifications": "Error",
+        "subject_body_correlation": "Error"
+    }
+
+
 class AIProcessor:
     """
     Handles the AI processing of emails using OpenAI or OpenRouter.
@@ -20,47 +170,79 @@ class AIProcessor:
     def __init__(self):
         """Initialize the AI Processor with configuration."""
         self.config = get_config()
-        self.processing_config = self.config.get_section('processing')
-        
+        settings = self.config.processing
+
         # API Configuration
         self.use_openrouter = self.config.should_use_openrouter()
-        self.model = self.processing_config.get('model', 'openai/gpt-4o-mini')
-        
+        self.model = settings.model
+
         # Processing settings
-        self.max_tokens = self.processing_config.get('max_tokens', 1000)
-        self.concurrency = self.processing_config.get('concurrency', 10)
-        self.sleep_between_batches = self.processing_config.get('sleep_between_batches', 0)
-        
+        self.max_tokens = settings.max_tokens
+        self.concurrency = settings.concurrency
+        self.emails_per_request = max(1, settings.emails_per_request)
+        self.use_tool_schema = settings.use_tool_schema
+        self.local_category_matching = settings.local_category_matching
+        self.category_matcher = None
+        self.max_body_chars = settings.max_body_chars
+        self.strip_quoted_replies = settings.strip_quoted_replies
+        self.chunk_size = settings.chunk_size
+        self.fast_io = settings.fast_io
+        self.checkpoint = settings.checkpoint
+
         # Retry settings
-        self.retry_attempts = self.processing_config.get('retry_attempts', 3)
-        self.retry_min_wait = self.processing_config.get('retry_min_wait', 2)
-        self.retry_max_wait = self.processing_config.get('retry_max_wait', 20)
-        
+        self.retry_attempts = settings.retry_attempts
+        self.retry_min_wait = settings.retry_min_wait
+        self.retry_max_wait = settings.retry_max_wait
+
+        # Paces requests at the provider's requests-per-minute limit
+        self.limiter = AsyncLimiter(settings.max_rpm, 60)
+
+        # Per-row problems, counted and summarized once per run of
+        # iter_ai_results instead of logged one by one from the event loop
+        self.issues = Counter()
+
+        # Persistent cache of responses to identical requests
+        self.cache = ResponseCache(settings.response_cache_path) if settings.response_cache else None
+
         # Initialize client
         self._init_client()
         
         # Prompt Template
-        self.prompt_template = USER_PROMPT_TEMPLATE
+        self.set_prompt_template(self._render_prompt(PRODUCT_LIST), PRODUCT_LIST)
+
+    def _render_prompt(self, product_list):
+        """Render the user prompt template for a product list."""
+        # With local matching the list is not sent at all; with the tool
+        # schema it is sent as an enum, not as prompt text
+        if self.local_category_matching:
+            slot = LOCAL_CATEGORY_NOTE
+        elif self.use_tool_schema:
+            slot = TOOL_PRODUCT_LIST_NOTE
+        else:
+            slot = product_list
+        return _PROMPT_PREFIX + slot + _PROMPT_SUFFIX
 
     def update_product_list(self, product_list_str):
         """Update the product list in the prompt template."""
         if not product_list_str or not product_list_str.strip():
             return
 
-        import re
-        # Use regex to find and replace the product categorization list in the prompt
-        product_list_pattern = r'(When identifying equipment or products.*?:\n)(.*?)(\n\n\*\*Analysis Instructions)'
-        
-        replacement = r'\1' + product_list_str.strip() + r'.\3'
-        
-        self.prompt_template = re.sub(
-            product_list_pattern,
-            replacement,
-            self.prompt_template,
-            flags=re.DOTALL
-        )
+        product_list = product_list_str.strip()
+        self.set_prompt_template(self._render_prompt(product_list), product_list)
         logger.info("✅ Updated AI prompt with custom product list")
 
+    def set_prompt_template(self, prompt_template, product_list=None):
+        """Use an already rendered prompt template (skips the product list rewrite)."""
+        self.prompt_template = prompt_template
+        if product_list is not None:
+            self.product_list = product_list
+            if self.local_category_matching and product_list == PRODUCT_LIST:
+                self.category_matcher = get_default_category_matcher()
+            elif self.local_category_matching:
+                self.category_matcher = get_category_matcher(split_product_list(product_list))
+        # Split once around the email slot; each prompt is then a concatenation
+        self._email_prefix, self._email_suffix = prompt_template.split("{EMAIL_DATA}", 1)
+
     def _init_client(self):
         """Initialize the AsyncOpenAI client."""
         try:
@@ -69,6 +251,14 @@ class AIProcessor:
             logger.error(str(e))
             raise
 
+        # One pooled connection set sized for the configured concurrency
+        pool_size = self.concurrency * 2
+        self.http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+
         if self.use_openrouter:
             self.client = AsyncOpenAI(
                 base_url="https://openrouter.ai/api/v1",
@@ -76,191 +266,474 @@ class AIProcessor:
                 default_headers={
                     "HTTP-Referer": "https://github.com/anciri/mail_processing_workflow",
                     "X-Title": "Email Processing Workflow"
-                }
+                },
+                http_client=self.http_client
             )
             logger.info(f"🔄 Using OpenRouter with model: {self.model}")
         else:
-            self.client = AsyncOpenAI(api_key=api_key)
+            self.client = AsyncOpenAI(api_key=api_key, http_client=self.http_client)
             logger.info(f"🤖 Using OpenAI directly with model: {self.model}")
 
-    def build_email_block(self, row, idx):
-        """Build text block for a single email."""
+    async def aclose(self):
+        """Close the HTTP connection pool and the response cache (call once processing is done)."""
+        await self.client.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def _report(self, kind, level, msg, *args):
+        """Count a per-row problem; log its first occurrence at `level`, the rest at DEBUG."""
+        self.issues[kind] += 1
+        if self.issues[kind] == 1:
+            logger.log(level, msg, *args)
+        else:
+            logger.debug(msg, *args)
+
+    def email_rows(self, df):
+        """
+        Materialize the prompt fields of df as plain tuples.
+
+        Avoids building a pandas Series per row; missing columns become ''.
+        Bodies are trimmed here, once per row (see prepare_body).
+
+        Args:
+            df: DataFrame of emails
+
+        Returns:
+            List of tuples in EMAIL_FIELDS order, one per row
+        """
+        fields = df.reindex(columns=list(EMAIL_FIELDS), fill_value='')
+        rows = fields.itertuples(index=False, name=None)
+        if not (self.max_body_chars or self.strip_quoted_replies):
+            return list(rows)
+        return [row[:-1] + (self.prepare_body(row[-1]),) for row in rows]
+
+    def prepare_body(self, body):
+        """
+        Trim an email body before it goes into a prompt.
+
+        Optionally drops quoted earlier messages, then caps the length at
+        max_body_chars, bounding input tokens and latency per request.
+        """
+        if not isinstance(body, str):
+            return body
+        if self.strip_quoted_replies:
+            body = strip_quoted_reply(body)
+        if self.max_body_chars and len(body) > self.max_body_chars:
+            body = body[:self.max_body_chars] + "... [truncated]"
+        return body
+
+    def email_fields_block(self, row):
+        """Build the text block of a single email (an EMAIL_FIELDS tuple), without its record ID."""
+        from_name, from_email, to, date, subject, body = row
         return (
-            f"ID: {idx+1}\n"
-            f"From Name: {row.get('From_Name','')}\n"
-            f"From Email: {row.get('From_Email','')}\n"
-            f"To: {row.get('To','')}\n"
-            f"Date: {row.get('Date','')}\n"
-            f"Subject: {row.get('Subject','')}\n"
-            f"Body: {row.get('Body','')}"
+            f"From Name: {from_name}\n"
+            f"From Email: {from_email}\n"
+            f"To: {to}\n"
+            f"Date: {date}\n"
+            f"Subject: {subject}\n"
+            f"Body: {body}"
         )
 
-    async def analyze_email(self, idx, row):
-        """Single async API call with retry expecting JSON response."""
-        email_data = self.build_email_block(row, idx)
-        prompt = self.prompt_template.format(EMAIL_DATA=email_data)
+    def group_duplicates(self, rows):
+        """
+        Group the rows whose email content is identical.
+
+        Args:
+            rows: List of EMAIL_FIELDS tuples (see email_rows)
+
+        Returns:
+            List of row-position lists, one per distinct email, in first-seen order
+        """
+        groups = {}
+        for idx, row in enumerate(rows):
+            groups.setdefault(self.email_fields_block(row), []).append(idx)
+        return list(groups.values())
+
+    def restamp_record_id(self, json_text, idx):
+        """Point a response shared between duplicate emails at row idx."""
+        try:
+            data = json_loads(json_text)
+        except ValueError:
+            return json_text
+
+        if not isinstance(data, dict) or data.get("record_id") == "error":
+            return json_text
+
+        data["record_id"] = idx + 1
+        return json_dumps(data)
+
+    def _cache_key(self, fields_block):
+        """Cache key of one email's analysis, keyed on its content rather than its ID."""
+        return cache_key(
+            m=self.model, s=SYSTEM_PROMPT, p=self.prompt_template,
+            e=fields_block, t=0, mx=self.max_tokens,
+            tool=self.use_tool_schema, pl=self.product_list
+        )
+
+    async def _request(self, prompt, max_tokens, multi=False):
+        """
+        Send one user prompt (with retry and rate limiting).
+
+        With use_tool_schema the model is made to call the analysis tool and
+        the tool arguments (already a JSON object) are returned instead.
+
+        Returns:
+            Tuple of (response text, complete), where complete is False if
+            the answer was cut off by the token limit
+        """
+        if self.use_tool_schema:
+            output_options = {
+                "tools": [build_analysis_tool(
+                    None if self.local_category_matching else self.product_list, multi
+                )],
+                "tool_choice": {"type": "function", "function": {"name": ANALYSIS_TOOL_NAME}},
+            }
+        else:
+            output_options = {"response_format": {"type": "json_object"}}
 
-        # Create a retry-decorated function
         @retry(
+            retry=retry_if_exception_type(RETRYABLE_ERRORS),
             wait=wait_exponential(multiplier=1, min=self.retry_min_wait, max=self.retry_max_wait),
-            stop=stop_after_attempt(self.retry_attempts)
+            stop=stop_after_attempt(self.retry_attempts),
+            reraise=True
         )
         async def _make_request():
-            return await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=0,
-                response_format={"type": "json_object"}
-            )
+            async with self.limiter:
+                return await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=0,
+                    **output_options
+                )
+
+        response = await _make_request()
+        choice = response.choices[0]
+        complete = choice.finish_reason != "length"
+        if choice.message.tool_calls:
+            return choice.message.tool_calls[0].function.arguments, complete
+        return choice.message.content, complete
+
+    async def analyze_email(self, idx, row):
+        """Single async API call with retry expecting JSON response (row is an EMAIL_FIELDS tuple)."""
+        fields_block = self.email_fields_block(row)
+        email_data = f"ID: {idx+1}\n" + fields_block
+        prompt = self._email_prefix + email_data + self._email_suffix
+
+        # temperature=0, so an identical request gets an identical answer
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(fields_block)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self.restamp_record_id(cached, idx)
 
         try:
-            response = await _make_request()
-            content = response.choices[0].message.content
+            content, complete = await self._request(prompt, self.max_tokens)
 
             # Validate response
             if not content:
-                logger.warning(f"⚠️  Empty response for email {idx+1}")
-                return json.dumps({"record_id": "error", "company_info": {"name": "Empty response"}})
+                self._report("empty responses", logging.WARNING, "⚠️  Empty response for email %d", idx + 1)
+                return _EMPTY_RESPONSE_JSON
 
+            # Only answers that parse are cached, so a bad one is retried next run
+            if key is not None and complete and is_valid_response(content):
+                self.cache.set(key, content)
             return content
         except Exception as e:
-            logger.error(f"❌ Error on email {idx+1}: {e}")
-            return json.dumps({"record_id": "error", "company_info": {"name": "API Error"}})
+            self._report("API errors", logging.ERROR, "❌ Error on email %d: %s", idx + 1, e)
+            return _API_ERROR_JSON
 
-    def parse_json(self, json_text):
-        """Parse JSON response from AI API."""
-        # Handle empty or None responses
-        if not json_text:
-            return self._get_empty_parsed_result("Empty or None response")
+    async def analyze_emails(self, idxs, rows):
+        """
+        Analyze several emails with a single API call.
 
+        The instructions are sent once for the whole group and the response is
+        split back per email by record_id. Emails missing from the response
+        are retried one by one with analyze_email.
+
+        Args:
+            idxs: Record positions of the emails (their IDs are idx+1)
+            rows: Matching EMAIL_FIELDS tuples
+
+        Returns:
+            List of JSON response strings, one per email, in input order
+        """
+        if len(rows) == 1:
+            return [await self.analyze_email(idxs[0], rows[0])]
+
+        blocks = [self.email_fields_block(row) for row in rows]
+        keys = [None] * len(rows)
+        results = [None] * len(rows)
+        pending = []
+
+        for pos, (idx, block) in enumerate(zip(idxs, blocks)):
+            if self.cache is not None:
+                keys[pos] = self._cache_key(block)
+                cached = self.cache.get(keys[pos])
+                if cached is not None:
+                    results[pos] = self.restamp_record_id(cached, idx)
+                    continue
+            pending.append(pos)
+
+        if not pending:
+            return results
+
+        email_data = "\n\n".join(f"ID: {idxs[pos]+1}\n{blocks[pos]}" for pos in pending)
+        prompt = self._email_prefix + email_data + self._email_suffix + MULTI_EMAIL_INSTRUCTIONS
+
+        records = []
+        complete = False
         try:
-            data = json.loads(json_text)
-            
-            # Ensure all fields exist with defaults
-            company_info = data.get("company_info", {})
-            
-            return {
-                "record_id": data.get("record_id", "Not found"),
-                "company_name": company_info.get("name", "Not specified"),
-                "company_website": company_info.get("website", "Not mentioned"),
-                "company_country": company_info.get("country", "Not specified"),
-                "email_category": data.get("email_category", "Not specified"),
-                "product_category": data.get("product_category", "Not specified"),
-                "equipment_requested": data.get("equipment_requested", "Not specified"),
-                "technical_specifications": data.get("technical_specifications", "None specified"),
-                "subject_body_correlation": data.get("subject_body_correlation", "Not specified")
-            }
-        except json.JSONDecodeError as e:
-            logger.warning(f"⚠️  JSON parse error: {e}")
-            return self._get_empty_parsed_result("JSON parse error")
+            content, complete = await self._request(prompt, self.max_tokens * len(pending), multi=True)
+            data = json_loads(content) if content else {}
+            records = data.get("results", []) if isinstance(data, dict) else []
         except Exception as e:
-            logger.error(f"⚠️  Unexpected error parsing JSON: {e}")
-            return self._get_empty_parsed_result("Unexpected error")
+            self._report(
+                "grouped request errors", logging.ERROR, "❌ Error on emails %d-%d: %s",
+                idxs[pending[0]] + 1, idxs[pending[-1]] + 1, e
+            )
 
-    def _get_empty_parsed_result(self, reason):
-        """Return a dict with default values for failed parsing."""
-        return {
-            "record_id": reason,
-            "company_name": "Error",
-            "company_website": "Error",
-            "company_country": "Error",
-            "email_category": "Error",
-            "product_category": "Error",
-            "equipment_requested": "Error",
-            "technical_specifications": "Error",
-            "subject_body_correlation": "Error"
+        by_id = {
+            str(record.get("record_id")).strip(): record
+            for record in records if isinstance(record, dict)
         }
 
-    async def process_batch(self, batch_indices, df):
-        """Process a batch of emails concurrently."""
-        tasks = [self.analyze_email(idx, df.iloc[idx]) for idx in batch_indices]
-        results = await asyncio.gather(*tasks)
+        for pos in pending:
+            idx = idxs[pos]
+            record = by_id.get(str(idx + 1))
+            if record is None:
+                self._report(
+                    "emails missing from grouped responses", logging.WARNING,
+                    "⚠️  Email %d missing from grouped response, retrying alone", idx + 1
+                )
+                results[pos] = await self.analyze_email(idx, rows[pos])
+                continue
+
+            results[pos] = json_dumps(record)
+            if keys[pos] is not None and complete:
+                self.cache.set(keys[pos], results[pos])
+
         return results
 
-    async def process_all_emails(self, df):
-        """Process all emails in batches with concurrency control."""
-        total = len(df)
-        all_results = []
+    def parse_json(self, json_text):
+        """Parse JSON response from AI API."""
+        parsed = parse_json(json_text)
+        if self.category_matcher is not None:
+            parsed["product_category"] = self.category_matcher.snap(parsed["product_category"])
+        return parsed
 
-        logger.info(f"🚀 Processing {total} emails with concurrency={self.concurrency}...")
+    def parse_results_columns(self, json_results):
+        """
+        Parse all AI responses into one list per PARSED_FIELDS column.
+
+        Args:
+            json_results: List of JSON response strings
 
-        for i in range(0, total, self.concurrency):
-            batch_end = min(i + self.concurrency, total)
-            batch_indices = list(range(i, batch_end))
+        Returns:
+            Dict of field -> list of values, one per response (see attach_parsed_columns)
+        """
+        columns = new_parsed_columns(len(json_results))
+        for idx, json_text in enumerate(json_results):
+            store_parsed(columns, idx, parse_json(json_text))
 
-            logger.info(f"📧 Processing batch {i+1}-{batch_end} of {total}...")
-            batch_results = await self.process_batch(batch_indices, df)
-            all_results.extend(batch_results)
+        if self.category_matcher is not None:
+            snap = self.category_matcher.snap
+            columns["product_category"] = [snap(value) for value in columns["product_category"]]
+        return columns
 
-            if self.sleep_between_batches > 0 and batch_end < total:
-                await asyncio.sleep(self.sleep_between_batches)
+    def checkpoint_for(self, output_path, *input_fingerprint):
+        """
+        Get the chunk checkpoint of a run, or None if checkpoints are off.
 
-        return all_results
+        Args:
+            output_path: Path of the output file of the run
+            input_fingerprint: Values identifying the input (e.g. its path and mtime)
 
-    def process_emails(self, input_file=None, output_file=None):
+        Returns:
+            ChunkCheckpoint keyed on the input and every setting that affects
+            the answers, or None
+        """
+        if not self.checkpoint:
+            return None
+        return ChunkCheckpoint.for_run(
+            output_path, *input_fingerprint,
+            self.model, self.max_tokens, self.chunk_size, self.prompt_template, self.product_list,
+            self.max_body_chars, self.strip_quoted_replies
+        )
+
+    async def process_in_chunks(self, df, checkpoint=None, on_chunk=None):
+        """
+        Analyze and parse df `chunk_size` rows at a time.
+
+        Only one chunk of raw responses is held in memory at once. With a
+        checkpoint, each parsed chunk is saved as soon as it is done and
+        chunks saved by an earlier, interrupted run are reused.
+
+        Args:
+            df: DataFrame of emails to analyze
+            checkpoint: Optional ChunkCheckpoint of this run
+            on_chunk: Optional callback(start, end, total) called before each chunk
+
+        Returns:
+            Dict of field -> list of values for the whole of df
+        """
+        columns = new_parsed_columns(len(df))
+
+        for start in range(0, len(df), self.chunk_size):
+            chunk = df.iloc[start:start + self.chunk_size]
+            end = start + len(chunk)
+            if on_chunk:
+                on_chunk(start, end, len(df))
+
+            part = checkpoint.load(start, len(chunk)) if checkpoint else None
+            if part is not None:
+                logger.info(f"♻️  Reusing checkpoint for emails {start+1}-{end}")
+            else:
+                json_results = [None] * len(chunk)
+                async for idx, json_text in self.iter_ai_results(chunk, start=start):
+                    json_results[idx] = json_text
+                part = self.parse_results_columns(json_results)
+                if checkpoint:
+                    checkpoint.save(start, part)
+
+            for field, values in part.items():
+                columns[field][start:end] = values
+
+        return columns
+
+    async def _process_and_close(self, df, checkpoint):
+        """Run process_in_chunks and release the connection pool on the same event loop."""
+        try:
+            return await self.process_in_chunks(df, checkpoint)
+        finally:
+            await self.aclose()
+
+    async def iter_ai_results(self, df, start=0):
+        """
+        Analyze all emails concurrently, yielding each result as soon as it lands.
+
+        Keeps up to `concurrency` requests in flight so callers can parse
+        responses while the remaining requests are still pending. Emails with
+        identical content are sent once and the response is yielded for every
+        duplicate; distinct emails are packed `emails_per_request` per call.
+
+        Args:
+            df: DataFrame of emails to analyze
+            start: Position of the first row in the full input (for record IDs
+                when df is a chunk)
+
+        Yields:
+            Tuples of (idx, json_text) in completion order, idx relative to df
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(pack):
+            idxs = [start + members[0] for members in pack]
+            pack_rows = [rows[members[0]] for members in pack]
+            async with semaphore:
+                try:
+                    return pack, await self.analyze_emails(idxs, pack_rows)
+                except Exception as e:
+                    # Never let one failed request abort the whole run
+                    self._report(
+                        "unexpected errors", logging.ERROR, "❌ Error on emails %d-%d: %s",
+                        idxs[0] + 1, idxs[-1] + 1, e
+                    )
+                    return pack, [_API_ERROR_JSON] * len(pack)
+
+        rows = self.email_rows(df)
+        groups = self.group_duplicates(rows)
+        k = self.emails_per_request
+        packs = [groups[i:i + k] for i in range(0, len(groups), k)]
+        logger.info(
+            f"🚀 Processing {len(df)} emails ({len(groups)} unique, {len(packs)} requests) "
+            f"with concurrency={self.concurrency}..."
+        )
+
+        tasks = [asyncio.create_task(_bounded(pack)) for pack in packs]
+        for next_done in asyncio.as_completed(tasks):
+            pack, results = await next_done
+            for members, result in zip(pack, results):
+                yield members[0], result
+                for idx in members[1:]:
+                    yield idx, self.restamp_record_id(result, start + idx)
+
+        if self.issues:
+            summary = ", ".join(f"{count} {kind}" for kind, count in self.issues.items())
+            logger.warning(f"⚠️  Emails {start+1}-{start+len(df)}: {summary}")
+            self.issues.clear()
+
+    def process_emails(self, input_file=None, output_file=None, input_df=None):
         """
         Main entry point for processing emails.
         
         Args:
-            input_file: Path to input Excel file (optional, defaults to config)
+            input_file: Path to input Excel, Parquet, Feather or CSV file (optional, defaults to config)
             output_file: Path to output Excel file (optional, defaults to config)
+            input_df: DataFrame of extracted emails, used instead of reading input_file
             
         Returns:
             bool: True if successful, False otherwise
         """
         # Use config defaults if not provided
-        input_path = input_file or self.processing_config.get('input_file', 'outputs/emails.xlsx')
-        output_path = output_file or self.processing_config.get('output_file', 'outputs/emails_processed.xlsx')
+        input_path = input_file or self.config.processing.input_file
+        output_path = output_file or self.config.processing.output_file
 
         logger.info("=" * 60)
         logger.info("EMAIL PROCESSING WITH AI ANALYSIS")
         logger.info("=" * 60)
 
-        # Check if input file exists
-        if not os.path.exists(input_path):
-            logger.error(f"❌ Error: Input file '{input_path}' not found!")
-            logger.error(f"   Please run the extractor script first to generate the input file.")
-            return False
-
-        # Load input Excel
-        logger.info(f"📂 Loading input file: {input_path}")
-        try:
-            df = pd.read_excel(input_path)
-            logger.info(f"✅ Loaded {len(df)} email records")
-        except Exception as e:
-            logger.error(f"❌ Error loading Excel file: {e}")
-            return False
+        if input_df is not None:
+            # Handed over in memory by the workflow: there is no file to read
+            df = compact_dtypes(input_df)
+            input_fingerprint = ('<memory>', frame_fingerprint(df))
+            logger.info(f"✅ Received {len(df)} email records")
+        else:
+            # Check if input file exists
+            if not os.path.exists(input_path):
+                logger.error(f"❌ Error: Input file '{input_path}' not found!")
+                logger.error(f"   Please run the extractor script first to generate the input file.")
+                return False
+
+            # Load input table (reader chosen by extension)
+            logger.info(f"📂 Loading input file: {input_path}")
+            try:
+                df = compact_dtypes(read_table(resolve_fast_io_path(input_path) if self.fast_io else input_path))
+                logger.info(f"✅ Loaded {len(df)} email records")
+            except Exception as e:
+                logger.error(f"❌ Error loading input file: {e}")
+                return False
+            input_fingerprint = (os.path.abspath(input_path), os.path.getmtime(input_path))
 
         if len(df) == 0:
             logger.warning("⚠️  No emails to process!")
             return True
 
-        # Process emails asynchronously
-        start_time = time.time()
-        xml_results = asyncio.run(self.process_all_emails(df))
-
-        # Parse JSON results
-        logger.info("\n📊 Parsing AI analysis results...")
-        parsed_results = [self.parse_json(json_text) for json_text in xml_results]
-
-        # Create output DataFrame
-        df_parsed = pd.DataFrame(parsed_results)
+        checkpoint = self.checkpoint_for(output_path, *input_fingerprint)
 
-        # Merge with original data
-        df_final = pd.concat([df.reset_index(drop=True), df_parsed], axis=1)
+        # Process and parse emails asynchronously, chunk by chunk
+        start_time = time.time()
+        columns = asyncio.run(self._process_and_close(df, checkpoint))
+        df_final = attach_parsed_columns(df, columns)
 
         # Save output
         try:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            df_final.to_excel(output_path, index=False)
+            write_excel(df_final, output_path)
+            if self.fast_io:
+                write_parquet_twin(df_final, output_path)
         except Exception as e:
             logger.error(f"❌ Error saving output file: {e}")
             return False
 
+        if checkpoint:
+            checkpoint.clear()
+
         elapsed_time = time.time() - start_time
 
         # Print summary
@@ -6,31 +6,41 @@ Refactored for modularity, maintainability, and extensibility.
 """
 import argparse
 import os
+import sys
 import pandas as pd
-from datetime import datetime
+import pythoncom
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Optional, List
 
 # Import configuration
 from config import (
     TARGET_ACCOUNT_EMAIL, TARGET_FOLDER_NAME, TARGET_SUBFOLDER_NAME,
     INBOX_FOLDER_NAME, OUTPUT_DIR, OUTPUT_FILENAME, EXCLUDED_FILENAME,
-    ERRORS_FILENAME, PROGRESS_INTERVAL
+    ERRORS_FILENAME, PROGRESS_INTERVAL, FAST_IO, PARALLEL_WORKERS
 )
 
 # Import models
-from models import EmailData, ExcludedEmail, ProcessingError, ProcessingStats, Location
+from models import (
+    EmailData, ExcludedEmail, ProcessingError, ProcessingStats, Location, error_tag_list
+)
 
 # Import utilities
-from utils.date_utils import parse_date, get_date_for_filtering
+from utils.date_utils import (
+    parse_date, get_date_for_filtering, split_date_range, outlook_date_restriction,
+    format_datetime
+)
 from utils.text_utils import clean_body_text
+from utils.io_utils import write_excel, write_fast_io_sidecar
 
 # Import extractors
 from extractors.email_extractor import EmailExtractor
 from extractors.content_analyzer import ContentAnalyzer
-from extractors.location_extractor import LocationExtractor
 
 # Import Outlook connector
 from outlook.connector import OutlookConnector
+from outlook.properties import read_header_properties
 
 
 class EmailProcessor:
@@ -47,7 +57,8 @@ class EmailProcessor:
         """
         self.email_extractor = EmailExtractor()
         self.content_analyzer = ContentAnalyzer()
-        self.location_extractor = LocationExtractor()
+        # Shared with the extractor, so the country patterns are compiled once
+        self.location_extractor = self.email_extractor.location_extractor
         self.outlook_connector = OutlookConnector()
 
         # Use custom filenames if provided, otherwise use defaults from config
@@ -58,7 +69,8 @@ class EmailProcessor:
     def process_folder(
         self,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        save_output: bool = True
     ) -> tuple:
         """
         Main function to process emails from specified Outlook folder.
@@ -66,31 +78,60 @@ class EmailProcessor:
         Args:
             start_date: Optional start date for filtering emails (inclusive)
             end_date: Optional end date for filtering emails (inclusive)
+            save_output: If False, the extracted emails are only returned as a
+                DataFrame and the main Excel file is not written (the excluded
+                and error files are still saved)
             
         Returns:
-            Tuple of (success: bool, stats: ProcessingStats, output_path: str)
+            Tuple of (success: bool, stats: ProcessingStats, output_path: str,
+            df: DataFrame of extracted emails or None)
         """
         try:
-            # Connect to Outlook
-            self.outlook_connector.connect()
-
-            # Get target folder
-            target_folder = self.outlook_connector.get_folder(
-                TARGET_ACCOUNT_EMAIL,
-                INBOX_FOLDER_NAME,
-                TARGET_FOLDER_NAME,
-                TARGET_SUBFOLDER_NAME
-            )
-
             # Display date filter info if applicable
             self._print_date_filter_info(start_date, end_date)
 
-            # Process all items in folder
-            results, excluded, errors, stats = self._process_items(
-                target_folder,
-                start_date,
-                end_date
-            )
+            if PARALLEL_WORKERS > 1 and start_date and end_date:
+                # Fan the date range out across parallel Outlook sessions
+                results, excluded, errors, stats = self._process_date_windows(
+                    start_date,
+                    end_date
+                )
+            else:
+                # Connect to Outlook
+                self.outlook_connector.connect()
+
+                # Get target folder
+                target_folder = self.outlook_connector.get_folder(
+                    TARGET_ACCOUNT_EMAIL,
+                    INBOX_FOLDER_NAME,
+                    TARGET_FOLDER_NAME,
+                    TARGET_SUBFOLDER_NAME
+                )
+
+                items = target_folder.Items
+                filtered_by_date = 0
+                if start_date or end_date:
+                    # Let Outlook evaluate the date range against its index
+                    # instead of reading ReceivedTime from every item; the
+                    # per-item date check below still runs as a backstop (and
+                    # dates the items Outlook has no received date for)
+                    total_count = items.Count
+                    items = items.Restrict(outlook_date_restriction(start_date, end_date))
+                    filtered_by_date = total_count - items.Count
+                items.Sort("[ReceivedTime]", True)
+
+                # Process the items in the date range (newest first)
+                if PARALLEL_WORKERS > 1:
+                    results, excluded, errors, stats = self._process_items_parallel(
+                        items,
+                        target_folder.StoreID,
+                        start_date,
+                        end_date
+                    )
+                else:
+                    results, excluded, errors, stats = self._process_items(items, start_date, end_date)
+                stats.total_items += filtered_by_date
+                stats.filtered_by_date += filtered_by_date
 
             # Calculate statistics
             self._calculate_stats(stats, results, excluded, errors)
@@ -99,14 +140,14 @@ class EmailProcessor:
             print(stats)
 
             # Save results to Excel files
-            output_path = self._save_results(results, excluded, errors)
+            output_path, df = self._save_results(results, excluded, errors, save_output)
             
-            return True, stats, output_path
+            return True, stats, output_path, df
 
         except Exception as e:
             print(f"Ocurrió un error inesperado: {e}")
             print("Por favor, asegúrate de que Outlook esté abierto y las carpetas existan.")
-            return False, None, None
+            return False, None, None, None
 
     def _print_date_filter_info(
         self,
@@ -124,14 +165,106 @@ class EmailProcessor:
                 date_filter_msg += f" hasta {end_date.strftime('%Y-%m-%d')}"
             print(date_filter_msg)
 
+    def _process_date_windows(
+        self,
+        start_date: datetime,
+        end_date: datetime
+    ) -> tuple:
+        """
+        Process a date range as parallel windows, one Outlook session per worker.
+
+        Returns:
+            Tuple of (results, excluded_emails, error_emails, stats)
+        """
+        windows = split_date_range(start_date, end_date, PARALLEL_WORKERS)
+        print(f"Procesando {len(windows)} ventanas de fechas en paralelo...")
+
+        with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+            parts = list(executor.map(
+                lambda window: self._process_date_window(*window, is_last=window[1] == end_date),
+                windows
+            ))
+
+        return self._merge_parts(parts)
+
+    @staticmethod
+    def _merge_parts(parts: List[tuple]) -> tuple:
+        """
+        Merge the outputs of parallel workers, in worker order.
+
+        Args:
+            parts: List of (results, excluded_emails, error_emails, stats) tuples
+
+        Returns:
+            Tuple of (results, excluded_emails, error_emails, stats)
+        """
+        results: List[EmailData] = []
+        excluded_emails: List[ExcludedEmail] = []
+        error_emails: List[ProcessingError] = []
+        stats = ProcessingStats()
+        for part_results, part_excluded, part_errors, part_stats in parts:
+            results.extend(part_results)
+            excluded_emails.extend(part_excluded)
+            error_emails.extend(part_errors)
+            stats.total_items += part_stats.total_items
+            stats.filtered_by_date += part_stats.filtered_by_date
+
+        print(f"\nProcesamiento completado!")
+        print(f"  Total de items procesados: {stats.total_items}")
+
+        return results, excluded_emails, error_emails, stats
+
+    def _process_date_window(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        is_last: bool
+    ) -> tuple:
+        """
+        Process one date window in its own Outlook session (worker thread).
+
+        COM objects can't be shared across threads, so each worker initializes
+        COM, connects and resolves the folder on its own.
+        """
+        pythoncom.CoInitialize()
+        try:
+            connector = OutlookConnector()
+            connector.connect()
+            target_folder = connector.get_folder(
+                TARGET_ACCOUNT_EMAIL,
+                INBOX_FOLDER_NAME,
+                TARGET_FOLDER_NAME,
+                TARGET_SUBFOLDER_NAME
+            )
+
+            # Only the last window includes its end date (and the undated
+            # items); the others stop just before the next window starts so no
+            # email is counted twice
+            items = target_folder.Items.Restrict(
+                outlook_date_restriction(
+                    window_start, window_end, end_inclusive=is_last, include_undated=is_last
+                )
+            )
+            filter_end = window_end if is_last else window_end - timedelta(microseconds=1)
+
+            label = f"[{window_start.strftime('%Y-%m-%d')}] "
+            return self._process_items(items, window_start, filter_end, label)
+        finally:
+            pythoncom.CoUninitialize()
+
     def _process_items(
         self,
-        target_folder,
+        items,
         start_date: Optional[datetime],
-        end_date: Optional[datetime]
+        end_date: Optional[datetime],
+        label: str = ""
     ) -> tuple:
         """
-        Process all items in the target folder.
+        Process all items in an Outlook Items collection.
+
+        Args:
+            label: Prefix of the progress lines (set by parallel workers, whose
+                summary is printed once the parts are merged)
 
         Returns:
             Tuple of (results, excluded_emails, error_emails, stats)
@@ -141,60 +274,176 @@ class EmailProcessor:
         error_emails: List[ProcessingError] = []
         stats = ProcessingStats()
 
-        print(f"Iniciando procesamiento... (sin filtro de Class, procesando todos los items)")
+        if not label:
+            print(f"Iniciando procesamiento... (sin filtro de Class, procesando todos los items)")
 
-        for item in target_folder.Items:
+        for item in items:
             stats.total_items += 1
+            self._print_progress(stats, results, excluded_emails, label)
+            self._process_item(item, start_date, end_date, results, excluded_emails, error_emails, stats)
 
-            # Progress indicator
-            if stats.total_items % PROGRESS_INTERVAL == 0:
-                print(f"  Procesando item {stats.total_items}... "
-                      f"(Emails procesados: {len(results)}, Excluidos: {len(excluded_emails)})")
+        if not label:
+            print(f"\nProcesamiento completado!")
+            print(f"  Total de items procesados: {stats.total_items}")
 
-            # Step 1: Date filtering (only if date filters are active)
-            if start_date or end_date:
-                should_skip, skip_reason = self._check_date_filter(
-                    item, start_date, end_date
-                )
+        return results, excluded_emails, error_emails, stats
 
-                if skip_reason == "error":
-                    # Couldn't read date but date filtering is active
-                    error_emails.append(ProcessingError(
-                        error="Cannot read date (date filtering active)",
-                        subject=getattr(item, 'Subject', 'Unknown'),
-                        date=""
-                    ))
-                    continue
+    @staticmethod
+    def _print_progress(
+        stats: ProcessingStats,
+        results: List[EmailData],
+        excluded_emails: List[ExcludedEmail],
+        label: str = ""
+    ) -> None:
+        """Print a progress line every PROGRESS_INTERVAL items."""
+        # Written unflushed; flushed every 10 lines so redirected output
+        # still shows progress
+        if stats.total_items % PROGRESS_INTERVAL == 0:
+            sys.stdout.write(f"  {label}Procesando item {stats.total_items}... "
+                             f"(Emails procesados: {len(results)}, Excluidos: {len(excluded_emails)})\n")
+            if stats.total_items % (PROGRESS_INTERVAL * 10) == 0:
+                sys.stdout.flush()
+
+    def _process_item(
+        self,
+        item,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        results: List[EmailData],
+        excluded_emails: List[ExcludedEmail],
+        error_emails: List[ProcessingError],
+        stats: ProcessingStats
+    ) -> None:
+        """Filter, analyze and extract a single Outlook item into the given lists."""
+        # Step 1: Date filtering (only if date filters are active)
+        # ReceivedTime is read once and reused by the date check and the output
+        received_time = None
+        if start_date or end_date:
+            try:
+                received_time = item.ReceivedTime
+            except Exception:
+                pass
 
-                if should_skip:
-                    stats.filtered_by_date += 1
-                    continue
+            should_skip, skip_reason = self._check_date_filter(
+                item, start_date, end_date, received_time
+            )
 
-            # Step 2: Content analysis for RFQ qualification
-            try:
-                subject = item.Subject or ""
-                body = item.Body or ""
+            if skip_reason == "error":
+                # Couldn't read date but date filtering is active
+                error_emails.append(ProcessingError(
+                    error="Cannot read date (date filtering active)",
+                    subject=getattr(item, 'Subject', 'Unknown'),
+                    date=""
+                ))
+                return
+
+            if should_skip:
+                stats.filtered_by_date += 1
+                return
+
+        # Step 2: Content analysis for RFQ qualification
+        # The header fields come in one PropertyAccessor round trip; they and
+        # the Body read here are handed on to the extractor, so each COM
+        # property is read only once per item
+        known_fields = read_header_properties(item)
+        if received_time:
+            known_fields['received_time'] = received_time
+        try:
+            subject = known_fields.get('subject')
+            if subject is None:
+                subject = known_fields['subject'] = item.Subject or ""
+            body = known_fields['body'] = item.Body or ""
 
-                qualifies, reason = self.content_analyzer.analyze(subject, body)
+            qualifies, reason = self.content_analyzer.analyze(subject, body)
 
-                if not qualifies:
-                    # Collect excluded email info
-                    excluded = self._create_excluded_email(item, subject, body, reason)
-                    if excluded:
-                        excluded_emails.append(excluded)
-                    continue
+            if not qualifies:
+                # Collect excluded email info
+                excluded = self._create_excluded_email(item, subject, body, reason, known_fields)
+                if excluded:
+                    excluded_emails.append(excluded)
+                return
 
-            except Exception:
-                # Can't analyze content, but still process the email
-                # It will be marked with error tags
-                qualifies = True
+        except Exception:
+            # Can't analyze content, but still process the email
+            # It will be marked with error tags
+            qualifies = True
 
-            # Step 3: Extract email data
-            email_data = self.email_extractor.extract(item)
-            results.append(email_data)
+        # Step 3: Extract email data
+        email_data = self.email_extractor.extract(item, **known_fields)
+        results.append(email_data)
 
-        print(f"\nProcesamiento completado!")
-        print(f"  Total de items procesados: {stats.total_items}")
+    def _process_items_parallel(
+        self,
+        items,
+        store_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> tuple:
+        """
+        Process an Items collection with PARALLEL_WORKERS Outlook sessions.
+
+        Only the EntryIDs are read here; each worker thread opens its own
+        session and re-binds its share of the items by ID, since COM objects
+        can't be shared across threads. Shares are contiguous, so the merged
+        lists keep the collection order.
+
+        Returns:
+            Tuple of (results, excluded_emails, error_emails, stats)
+        """
+        print(f"Iniciando procesamiento en paralelo ({PARALLEL_WORKERS} sesiones)...")
+        entry_ids = [item.EntryID for item in items]
+
+        size = -(-len(entry_ids) // PARALLEL_WORKERS) or 1
+        shares = [entry_ids[i:i + size] for i in range(0, len(entry_ids), size)]
+
+        with ThreadPoolExecutor(max_workers=max(len(shares), 1)) as executor:
+            parts = list(executor.map(
+                lambda numbered: self._process_entry_ids(
+                    numbered[1], store_id, start_date, end_date, label=f"[Sesión {numbered[0]}] "
+                ),
+                enumerate(shares, 1)
+            ))
+
+        return self._merge_parts(parts)
+
+    def _process_entry_ids(
+        self,
+        entry_ids: List[str],
+        store_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        label: str = ""
+    ) -> tuple:
+        """
+        Process a share of items by EntryID in its own Outlook session (worker thread).
+
+        Args:
+            label: Prefix of this worker's progress lines
+
+        Returns:
+            Tuple of (results, excluded_emails, error_emails, stats)
+        """
+        results: List[EmailData] = []
+        excluded_emails: List[ExcludedEmail] = []
+        error_emails: List[ProcessingError] = []
+        stats = ProcessingStats()
+
+        pythoncom.CoInitialize()
+        try:
+            connector = OutlookConnector()
+            connector.connect()
+
+            for entry_id in entry_ids:
+                stats.total_items += 1
+                self._print_progress(stats, results, excluded_emails, label)
+                try:
+                    item = connector.namespace.GetItemFromID(entry_id, store_id)
+                except Exception as e:
+                    error_emails.append(ProcessingError(error=f"Cannot open item: {e}"))
+                    continue
+                self._process_item(item, start_date, end_date, results, excluded_emails, error_emails, stats)
+        finally:
+            pythoncom.CoUninitialize()
 
         return results, excluded_emails, error_emails, stats
 
@@ -202,16 +451,20 @@ class EmailProcessor:
         self,
         email,
         start_date: Optional[datetime],
-        end_date: Optional[datetime]
+        end_date: Optional[datetime],
+        received_time: Optional[datetime] = None
     ) -> tuple:
         """
         Check if email should be filtered by date.
 
+        Args:
+            received_time: ReceivedTime already read from the email (optional)
+
         Returns:
             Tuple of (should_skip: bool, reason: str)
             reason can be: "ok", "skip", or "error"
         """
-        received_date = get_date_for_filtering(email)
+        received_date = get_date_for_filtering(email, received_time)
 
         if not received_date:
             # Couldn't read date from any source
@@ -231,24 +484,40 @@ class EmailProcessor:
         email,
         subject: str,
         body: str,
-        reason: str
+        reason: str,
+        known_fields: Optional[dict] = None
     ) -> Optional[ExcludedEmail]:
-        """Create ExcludedEmail object from email"""
-        try:
-            sender_email_addr = ""
-            if hasattr(email, 'SenderEmailAddress'):
-                sender_email_addr = email.SenderEmailAddress
+        """
+        Create ExcludedEmail object from email.
 
-            location = self.location_extractor.extract(subject, body, sender_email_addr)
+        Subject, body and any header fields in known_fields are the values
+        already read for the content analysis. The body is cleaned once and
+        that text is used both for the location search and for the output,
+        as on the extraction path.
+        """
+        known_fields = known_fields or {}
+        try:
+            sender_email_addr = known_fields.get('sender_email')
+            if sender_email_addr is None:
+                sender_email_addr = getattr(email, 'SenderEmailAddress', "")
+            sender_name = known_fields.get('sender_name')
+            if sender_name is None:
+                sender_name = email.SenderName
+            received_time = known_fields.get('received_time')
+            if received_time is None:
+                received_time = getattr(email, 'ReceivedTime', None)
+            body_text = clean_body_text(body)
+
+            location = self.location_extractor.extract(subject, body_text, sender_email_addr)
 
             excluded = ExcludedEmail(
-                from_name=email.SenderName or "",
+                from_name=sender_name or "",
                 from_email=sender_email_addr,
-                date=email.ReceivedTime.strftime('%Y-%m-%d %H:%M:%S') if hasattr(email, 'ReceivedTime') else "",
+                date=format_datetime(received_time) if received_time is not None else "",
                 subject=subject,
                 location=location,
                 exclusion_reason=reason,
-                body=clean_body_text(body)
+                body=body_text
             )
 
             return excluded
@@ -256,6 +525,18 @@ class EmailProcessor:
         except Exception:
             return None
 
+    @staticmethod
+    def _write_main_output(df: pd.DataFrame, output_path: str) -> None:
+        """
+        Write the extracted emails workbook, then its Feather sidecar.
+
+        The sidecar is only read when it is at least as recent as the
+        workbook, so it must be written after the workbook is complete.
+        """
+        write_excel(df, output_path)
+        if FAST_IO:
+            write_fast_io_sidecar(df, output_path)
+
     def _calculate_stats(
         self,
         stats: ProcessingStats,
@@ -268,58 +549,76 @@ class EmailProcessor:
         stats.error_count = len(errors)
         stats.extracted_count = len(results)
 
-        # Count emails with processing errors
-        for email in results:
-            if email.error_tags:
-                stats.partial_error_count += 1
-                for tag in email.error_tags:
-                    stats.error_breakdown[tag] = stats.error_breakdown.get(tag, 0) + 1
-            else:
-                stats.complete_count += 1
+        # Count emails with processing errors: one count per distinct error
+        # mask, expanded into tags only once per mask
+        mask_counts = Counter(email.error_mask for email in results)
+        stats.complete_count += mask_counts.pop(0, 0)
+        for mask, count in mask_counts.items():
+            stats.partial_error_count += count
+            for tag in error_tag_list(mask):
+                stats.error_breakdown[tag] = stats.error_breakdown.get(tag, 0) + count
 
     def _save_results(
         self,
         results: List[EmailData],
         excluded: List[ExcludedEmail],
-        errors: List[ProcessingError]
-    ) -> str:
+        errors: List[ProcessingError],
+        save_output: bool = True
+    ) -> tuple:
         """
         Save results to Excel files using custom or default filenames.
+
+        Args:
+            save_output: If False, the main output file is not written
         
         Returns:
-            Path to the main output file
+            Tuple of (path to the main output file, DataFrame of results or None)
         """
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         output_path = os.path.join(OUTPUT_DIR, self.output_filename)
-
-        # Save valid RFQ emails
-        if results:
-            results_dicts = [email.to_dict() for email in results]
-            df = pd.DataFrame(results_dicts)
-            df.to_excel(output_path, index=False)
+        df = pd.DataFrame(EmailData.to_columns(results)) if results else None
+
+        # The files are independent, so they are written concurrently; the
+        # messages are printed afterwards, in the usual order
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            writes = []
+
+            # Save valid RFQ emails
+            if results and save_output:
+                writes.append(executor.submit(self._write_main_output, df, output_path))
+
+            # Save excluded emails
+            if excluded:
+                excluded_path = os.path.join(OUTPUT_DIR, self.excluded_filename)
+                df_excluded = pd.DataFrame(ExcludedEmail.to_columns(excluded))
+                writes.append(executor.submit(write_excel, df_excluded, excluded_path))
+
+            # Save error emails
+            if errors:
+                error_path = os.path.join(OUTPUT_DIR, self.errors_filename)
+                df_errors = pd.DataFrame(ProcessingError.to_columns(errors))
+                writes.append(executor.submit(write_excel, df_errors, error_path))
+
+            # Re-raise the first write error, if any
+            for write in writes:
+                write.result()
+
+        if results and save_output:
             print(f"\n¡Análisis completo! {len(results)} correos guardados en '{output_path}'")
+        elif results:
+            print(f"\n¡Análisis completo! {len(results)} correos extraídos (sin guardar en Excel)")
         else:
             print("\nNo se encontraron correos en la carpeta.")
             # Create empty file if needed or handle as appropriate
             # For now, we still return the path where it would be
 
-        # Save excluded emails
         if excluded:
-            excluded_path = os.path.join(OUTPUT_DIR, self.excluded_filename)
-            excluded_dicts = [email.to_dict() for email in excluded]
-            df_excluded = pd.DataFrame(excluded_dicts)
-            df_excluded.to_excel(excluded_path, index=False)
             print(f"Correos excluidos guardados en '{excluded_path}'")
 
-        # Save error emails
         if errors:
-            error_path = os.path.join(OUTPUT_DIR, self.errors_filename)
-            error_dicts = [error.to_dict() for error in errors]
-            df_errors = pd.DataFrame(error_dicts)
-            df_errors.to_excel(error_path, index=False)
             print(f"Errores de procesamiento guardados en '{error_path}'")
-            
-        return output_path
+
+        return output_path, df
 
 
 def main():
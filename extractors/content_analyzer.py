@@ -2,6 +2,49 @@
 Content analyzer - determines if an email qualifies as an RFQ.
 """
 import re
+from typing import Optional
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    Finds keywords from a fixed list in a text.
+
+    With pyahocorasick installed, a miss (the common case) costs a single
+    Aho-Corasick pass over the text instead of one substring search per
+    keyword. Without it, plain `in` checks are used: for short keyword lists
+    they beat a regex alternation, which retries every branch at every
+    position.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    def contains(self, text: str) -> bool:
+        """Return True if any keyword is contained in text."""
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        return any(keyword in text for keyword in self.keywords)
+
+    def first(self, text: str) -> Optional[str]:
+        """Return the first keyword (in list order) contained in text, or None."""
+        if self._automaton is not None and next(self._automaton.iter(text), None) is None:
+            return None
+
+        for keyword in self.keywords:
+            if keyword in text:
+                return keyword
+        return None
 
 
 class ContentAnalyzer:
@@ -24,7 +67,8 @@ class ContentAnalyzer:
     ]
 
     def __init__(self):
-        pass
+        self.exclusion_matcher = KeywordMatcher(self.EXCLUSION_KEYWORDS)
+        self.rfq_matcher = KeywordMatcher(self.RFQ_KEYWORDS)
 
     def analyze(self, subject: str, body: str) -> tuple:
         """
@@ -40,19 +84,22 @@ class ContentAnalyzer:
         if not subject and not body:
             return False, "Empty email"
 
+        # Check for exclusion keywords first, in the subject before the body:
+        # an auto-reply subject settles it without lowercasing the body
         subject_lower = (subject or "").lower()
-        body_lower = (body or "").lower()
-        combined = f"{subject_lower} {body_lower}"
+        keyword = self.exclusion_matcher.first(subject_lower)
+        if keyword:
+            return False, f"Auto-reply or notification (keyword: {keyword})"
 
-        # Check for exclusion keywords first
-        for keyword in self.EXCLUSION_KEYWORDS:
-            if keyword in combined:
-                return False, f"Auto-reply or notification (keyword: {keyword})"
+        # Subject and body are scanned separately, never copied into one string
+        body_lower = (body or "").lower()
+        keyword = self.exclusion_matcher.first(body_lower)
+        if keyword:
+            return False, f"Auto-reply or notification (keyword: {keyword})"
 
         # Check for RFQ keywords
-        for keyword in self.RFQ_KEYWORDS:
-            if keyword in combined:
-                return True, "RFQ keyword found"
+        if self.rfq_matcher.contains(subject_lower) or self.rfq_matcher.contains(body_lower):
+            return True, "RFQ keyword found"
 
         # Check if email contains question marks (suggests inquiry)
         if '?' in subject or body.count('?') >= 2:
@@ -1,79 +1,114 @@
 """
 Email extractor - extracts data from Outlook email objects.
 """
-from models import EmailData, Location
+from typing import Optional
+
+from models import EmailData, Location, ERROR_BITS
+from utils.date_utils import format_datetime
 from utils.text_utils import clean_body_text, extract_email_address
 from extractors.location_extractor import LocationExtractor
 
 
+def _safe_get(obj, attr: str, tag: str, email_data: EmailData, default=""):
+    """
+    Read a property of a COM object, falling back to `default`.
+
+    A failed read sets `tag` in email_data's error mask; an empty value just
+    returns `default`.
+    """
+    try:
+        value = getattr(obj, attr)
+    except Exception:
+        email_data.error_mask |= ERROR_BITS[tag]
+        return default
+    return value or default
+
+
 class EmailExtractor:
     """Extracts structured data from Outlook email objects."""
 
     def __init__(self):
         self.location_extractor = LocationExtractor()
 
-    def extract(self, email) -> EmailData:
+    def extract(
+        self,
+        email,
+        subject: Optional[str] = None,
+        body: Optional[str] = None,
+        sender_name: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        to: Optional[str] = None,
+        cc: Optional[str] = None,
+        received_time=None
+    ) -> EmailData:
         """
         Extract all relevant data from an email.
 
+        Every property read is a cross-process COM call, so values the caller
+        has already read can be passed in instead of being read again.
+
         Args:
             email: Outlook email object
+            subject: Subject already read from the email (optional)
+            body: Raw body already read from the email (optional)
+            sender_name, sender_email, to, cc: Header fields already read
+                from the email (optional)
+            received_time: ReceivedTime already read from the email (optional)
 
         Returns:
             EmailData object with extracted information
         """
         email_data = EmailData()
-        error_tags = []
 
         # Extract basic fields
-        try:
-            email_data.from_name = email.SenderName or ""
-        except Exception:
-            error_tags.append("ERROR_FROM_NAME")
+        if sender_name is None:
+            sender_name = _safe_get(email, 'SenderName', 'ERROR_FROM_NAME', email_data)
+        email_data.from_name = sender_name
 
-        try:
-            email_data.from_email = extract_email_address(email.SenderEmailAddress or "")
-        except Exception:
-            error_tags.append("ERROR_FROM_EMAIL")
+        if sender_email is None:
+            sender_email = _safe_get(email, 'SenderEmailAddress', 'ERROR_FROM_EMAIL', email_data)
+        email_data.from_email = extract_email_address(sender_email)
 
-        try:
-            email_data.to = email.To or ""
-        except Exception:
-            error_tags.append("ERROR_TO")
+        if to is None:
+            to = _safe_get(email, 'To', 'ERROR_TO', email_data)
+        email_data.to = to
 
-        try:
-            email_data.cc = email.CC or ""
-        except Exception:
-            error_tags.append("ERROR_CC")
+        if cc is None:
+            cc = _safe_get(email, 'CC', 'ERROR_CC', email_data)
+        email_data.cc = cc
 
+        # Not every item type has a ReceivedTime; that alone is not an error
         try:
-            if hasattr(email, 'ReceivedTime') and email.ReceivedTime:
-                email_data.date = email.ReceivedTime.strftime('%Y-%m-%d %H:%M:%S')
+            if received_time is None:
+                received_time = getattr(email, 'ReceivedTime', None)
+            if received_time:
+                email_data.date = format_datetime(received_time)
         except Exception:
-            error_tags.append("ERROR_DATE")
+            email_data.error_mask |= ERROR_BITS['ERROR_DATE']
 
-        try:
-            email_data.subject = email.Subject or ""
-        except Exception:
-            error_tags.append("ERROR_SUBJECT")
+        if subject is None:
+            subject = _safe_get(email, 'Subject', 'ERROR_SUBJECT', email_data)
+        email_data.subject = subject
 
-        try:
-            email_data.body = clean_body_text(email.Body or "")
-        except Exception:
-            error_tags.append("ERROR_BODY")
+        if body is None:
+            body = _safe_get(email, 'Body', 'ERROR_BODY', email_data)
+        email_data.body = clean_body_text(body)
 
         # Extract attachments
+        # Count is read first so the many emails without attachments cost one
+        # COM call; the others are indexed (1-based) instead of enumerated
         try:
             attachments = []
-            if hasattr(email, 'Attachments'):
-                for attachment in email.Attachments:
-                    try:
-                        attachments.append(attachment.FileName)
-                    except Exception:
-                        pass
+            email_attachments = getattr(email, 'Attachments', None)
+            count = email_attachments.Count if email_attachments is not None else 0
+            for i in range(1, count + 1):
+                try:
+                    attachments.append(email_attachments.Item(i).FileName)
+                except Exception:
+                    pass
             email_data.attachments = "; ".join(attachments) if attachments else ""
         except Exception:
-            error_tags.append("ERROR_ATTACHMENTS")
+            email_data.error_mask |= ERROR_BITS['ERROR_ATTACHMENTS']
 
         # Extract location
         try:
@@ -83,7 +118,6 @@ class EmailExtractor:
                 email_data.from_email
             )
         except Exception:
-            error_tags.append("ERROR_LOCATION")
+            email_data.error_mask |= ERROR_BITS['ERROR_LOCATION']
 
-        email_data.error_tags = error_tags
         return email_data
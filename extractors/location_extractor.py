@@ -19,45 +19,49 @@ class LocationExtractor:
         'China', 'India', 'Japan', 'Australia', 'New Zealand'
     ]
 
-    # Email domain to country mapping
+    # Email top-level domain (without the dot) to country mapping
     DOMAIN_COUNTRY_MAP = {
-        '.es': 'Spain',
-        '.mx': 'Mexico',
-        '.ar': 'Argentina',
-        '.cl': 'Chile',
-        '.co': 'Colombia',
-        '.pe': 'Peru',
-        '.ve': 'Venezuela',
-        '.ec': 'Ecuador',
-        '.bo': 'Bolivia',
-        '.py': 'Paraguay',
-        '.uy': 'Uruguay',
-        '.cr': 'Costa Rica',
-        '.pa': 'Panama',
-        '.gt': 'Guatemala',
-        '.hn': 'Honduras',
-        '.ni': 'Nicaragua',
-        '.sv': 'El Salvador',
-        '.do': 'Dominican Republic',
-        '.cu': 'Cuba',
-        '.pr': 'Puerto Rico',
-        '.us': 'USA',
-        '.ca': 'Canada',
-        '.br': 'Brazil',
-        '.pt': 'Portugal',
-        '.fr': 'France',
-        '.de': 'Germany',
-        '.it': 'Italy',
-        '.uk': 'UK',
-        '.cn': 'China',
-        '.in': 'India',
-        '.jp': 'Japan',
-        '.au': 'Australia',
-        '.nz': 'New Zealand'
+        'es': 'Spain',
+        'mx': 'Mexico',
+        'ar': 'Argentina',
+        'cl': 'Chile',
+        'co': 'Colombia',
+        'pe': 'Peru',
+        've': 'Venezuela',
+        'ec': 'Ecuador',
+        'bo': 'Bolivia',
+        'py': 'Paraguay',
+        'uy': 'Uruguay',
+        'cr': 'Costa Rica',
+        'pa': 'Panama',
+        'gt': 'Guatemala',
+        'hn': 'Honduras',
+        'ni': 'Nicaragua',
+        'sv': 'El Salvador',
+        'do': 'Dominican Republic',
+        'cu': 'Cuba',
+        'pr': 'Puerto Rico',
+        'us': 'USA',
+        'ca': 'Canada',
+        'br': 'Brazil',
+        'pt': 'Portugal',
+        'fr': 'France',
+        'de': 'Germany',
+        'it': 'Italy',
+        'uk': 'UK',
+        'cn': 'China',
+        'in': 'India',
+        'jp': 'Japan',
+        'au': 'Australia',
+        'nz': 'New Zealand'
     }
 
     def __init__(self):
-        pass
+        # All country names in one whole-word pattern (longest first, so a
+        # name is never cut short by a shorter alternative)
+        self._country_by_lower = {country.lower(): country for country in self.COUNTRIES}
+        names = sorted(self._country_by_lower, key=len, reverse=True)
+        self._country_pattern = re.compile(r'\b(' + '|'.join(map(re.escape, names)) + r')\b')
 
     def extract(self, subject: str, body: str, email_address: str) -> Location:
         """
@@ -92,25 +96,26 @@ class LocationExtractor:
         if not email_address:
             return ""
 
-        email_lower = email_address.lower()
+        # The TLD is whatever follows the last dot: one dict lookup
+        _, dot, tld = email_address.lower().rpartition('.')
+        if not dot:
+            return ""
 
-        for domain, country in self.DOMAIN_COUNTRY_MAP.items():
-            if email_lower.endswith(domain):
-                return country
-
-        return ""
+        return self.DOMAIN_COUNTRY_MAP.get(tld, "")
 
     def _extract_country_from_text(self, text: str) -> str:
         """Extract country from text content."""
         if not text:
             return ""
 
-        text_lower = text.lower()
+        # One pass collects every country mentioned
+        found = set(self._country_pattern.findall(text.lower()))
+        if not found:
+            return ""
 
+        # Report the first one in COUNTRIES order, as before
         for country in self.COUNTRIES:
-            # Create a regex pattern to match the country name as a whole word
-            pattern = r'\b' + re.escape(country.lower()) + r'\b'
-            if re.search(pattern, text_lower):
+            if country.lower() in found:
                 return country
 
         return ""
@@ -1,11 +1,40 @@
 """
 Data models for email processing.
 """
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Dict, Optional
 
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Extraction error tags, in extraction order; EmailData keeps them as bits
+ERROR_TAGS = (
+    'ERROR_FROM_NAME', 'ERROR_FROM_EMAIL', 'ERROR_TO', 'ERROR_CC', 'ERROR_DATE',
+    'ERROR_SUBJECT', 'ERROR_BODY', 'ERROR_ATTACHMENTS', 'ERROR_LOCATION'
+)
+ERROR_BITS = {tag: 1 << i for i, tag in enumerate(ERROR_TAGS)}
+
+
+@lru_cache(maxsize=None)
+def error_tag_list(mask: int) -> tuple:
+    """
+    Expand an error mask into its tags, in extraction order.
+
+    Example:
+        0b101 -> ('ERROR_FROM_NAME', 'ERROR_TO')
+    """
+    return tuple(tag for tag in ERROR_TAGS if mask & ERROR_BITS[tag])
+
+
+@lru_cache(maxsize=None)
+def error_tags_text(mask: int) -> str:
+    """Join the tags of an error mask for the Error_Tags column."""
+    return "; ".join(error_tag_list(mask))
+
+
+@dataclass(**_SLOTS)
 class Location:
     """Represents a location extracted from email."""
     city: str = ""
@@ -17,7 +46,7 @@ class Location:
         return ", ".join(parts) if parts else ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EmailData:
     """Represents extracted email data."""
     from_name: str = ""
@@ -29,7 +58,12 @@ class EmailData:
     body: str = ""
     attachments: str = ""
     location: Optional[Location] = None
-    error_tags: List[str] = field(default_factory=list)
+    error_mask: int = 0
+
+    @property
+    def error_tags(self) -> List[str]:
+        """Error tags set in error_mask, in extraction order."""
+        return list(error_tag_list(self.error_mask))
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for DataFrame."""
@@ -43,11 +77,27 @@ class EmailData:
             'Body': self.body,
             'Attachments': self.attachments,
             'Location': str(self.location) if self.location else "",
-            'Error_Tags': "; ".join(self.error_tags) if self.error_tags else ""
+            'Error_Tags': error_tags_text(self.error_mask)
         }
 
+    @staticmethod
+    def to_columns(emails: List['EmailData']) -> Dict[str, List]:
+        """Convert many emails to column lists for DataFrame, without per-row dicts."""
+        return {
+            'From_Name': [e.from_name for e in emails],
+            'From_Email': [e.from_email for e in emails],
+            'To': [e.to for e in emails],
+            'CC': [e.cc for e in emails],
+            'Date': [e.date for e in emails],
+            'Subject': [e.subject for e in emails],
+            'Body': [e.body for e in emails],
+            'Attachments': [e.attachments for e in emails],
+            'Location': [str(e.location) if e.location else "" for e in emails],
+            'Error_Tags': [error_tags_text(e.error_mask) for e in emails]
+        }
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class ExcludedEmail:
     """Represents an excluded email with reason."""
     from_name: str = ""
@@ -70,8 +120,21 @@ class ExcludedEmail:
             'Exclusion_Reason': self.exclusion_reason
         }
 
+    @staticmethod
+    def to_columns(emails: List['ExcludedEmail']) -> Dict[str, List]:
+        """Convert many excluded emails to column lists for DataFrame."""
+        return {
+            'From_Name': [e.from_name for e in emails],
+            'From_Email': [e.from_email for e in emails],
+            'Date': [e.date for e in emails],
+            'Subject': [e.subject for e in emails],
+            'Body': [e.body for e in emails],
+            'Location': [str(e.location) if e.location else "" for e in emails],
+            'Exclusion_Reason': [e.exclusion_reason for e in emails]
+        }
+
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ProcessingError:
     """Represents a processing error."""
     error: str = ""
@@ -86,6 +149,15 @@ class ProcessingError:
             'Date': self.date
         }
 
+    @staticmethod
+    def to_columns(errors: List['ProcessingError']) -> Dict[str, List]:
+        """Convert many errors to column lists for DataFrame."""
+        return {
+            'Error': [e.error for e in errors],
+            'Subject': [e.subject for e in errors],
+            'Date': [e.date for e in errors]
+        }
+
 
 @dataclass
 class ProcessingStats:
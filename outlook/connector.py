@@ -1,8 +1,32 @@
 """
 Outlook connector - handles connection to Outlook and folder navigation.
 """
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pythoncom
 import win32com.client
 
+from outlook.properties import FOLDER_PROPERTIES, read_properties
+
+
+def dispatch_outlook():
+    """
+    Get the Outlook.Application COM object, early-bound when possible.
+
+    gencache.EnsureDispatch generates (once, then reuses) Python wrappers
+    from Outlook's type library, so each property read is a single Invoke
+    with a known DISPID instead of a GetIDsOfNames + Invoke pair. A stale or
+    broken generated cache raises AttributeError; the late-bound Dispatch
+    is used then.
+    """
+    try:
+        return win32com.client.gencache.EnsureDispatch("Outlook.Application")
+    except AttributeError:
+        return win32com.client.Dispatch("Outlook.Application")
+
 
 class OutlookConnector:
     """Handles connection to Microsoft Outlook."""
@@ -10,6 +34,8 @@ class OutlookConnector:
     def __init__(self):
         self.outlook = None
         self.namespace = None
+        # Open stores and their roots, shared by the folder search approaches
+        self._stores_cache = None
 
     def connect(self):
         """
@@ -19,8 +45,10 @@ class OutlookConnector:
             Exception if Outlook cannot be accessed
         """
         try:
-            self.outlook = win32com.client.Dispatch("Outlook.Application")
+            self.outlook = dispatch_outlook()
             self.namespace = self.outlook.GetNamespace("MAPI")
+            # Objects resolved through an earlier session are not reused
+            self._stores_cache = None
             print("✅ Conectado a Outlook exitosamente")
         except Exception as e:
             raise Exception(
@@ -87,13 +115,42 @@ class OutlookConnector:
             f"4. Asegúrate de que Outlook esté completamente cargado\n"
         )
 
+    @staticmethod
+    def _item_count(folder):
+        """
+        Get a folder's item count for display.
+
+        The count is read from the folder's MAPI metadata (PR_CONTENT_COUNT)
+        instead of building its Items collection; Items.Count is only the
+        fallback.
+        """
+        count = read_properties(folder, FOLDER_PROPERTIES).get('item_count')
+        if count is None:
+            count = folder.Items.Count
+        return count
+
+    def _get_stores(self):
+        """
+        Get the (store, root folder) pairs of the open stores, once per session.
+
+        Stores that are not open (e.g. offline PST files) are left out rather
+        than forced open.
+        """
+        if self._stores_cache is None:
+            stores = []
+            for store in self.namespace.Stores:
+                try:
+                    if store.IsOpen:
+                        stores.append((store, store.GetRootFolder()))
+                except Exception:
+                    continue
+            self._stores_cache = stores
+        return self._stores_cache
+
     def _try_store_access(self, folder_name: str, subfolder_name: str, inbox_name: str):
         """Try to access folder through default store."""
-        stores = self.namespace.Stores
-        for store in stores:
+        for store, root_folder in self._get_stores():
             try:
-                root_folder = store.GetRootFolder()
-
                 # Try to find the folder directly under root
                 try:
                     target = root_folder.Folders[folder_name]
@@ -101,7 +158,7 @@ class OutlookConnector:
                     if subfolder_name:
                         target = target.Folders[subfolder_name]
                         print(f"✅ Subcarpeta encontrada: {subfolder_name}")
-                    print(f"📧 Items encontrados: {target.Items.Count}")
+                    print(f"📧 Items encontrados: {self._item_count(target)}")
                     return target
                 except Exception:
                     pass
@@ -114,7 +171,7 @@ class OutlookConnector:
                     if subfolder_name:
                         target = target.Folders[subfolder_name]
                         print(f"✅ Subcarpeta encontrada: {subfolder_name}")
-                    print(f"📧 Items encontrados: {target.Items.Count}")
+                    print(f"📧 Items encontrados: {self._item_count(target)}")
                     return target
                 except Exception:
                     pass
@@ -143,7 +200,7 @@ class OutlookConnector:
                 if subfolder_name:
                     target = target.Folders[subfolder_name]
                     print(f"✅ Subcarpeta encontrada: {subfolder_name}")
-                print(f"📧 Items encontrados: {target.Items.Count}")
+                print(f"📧 Items encontrados: {self._item_count(target)}")
                 return target
             except Exception:
                 pass
@@ -156,7 +213,7 @@ class OutlookConnector:
                 if subfolder_name:
                     target = target.Folders[subfolder_name]
                     print(f"✅ Subcarpeta encontrada: {subfolder_name}")
-                print(f"📧 Items encontrados: {target.Items.Count}")
+                print(f"📧 Items encontrados: {self._item_count(target)}")
                 return target
             except Exception:
                 pass
@@ -167,47 +224,116 @@ class OutlookConnector:
         return None
 
     def _try_search_all_stores(self, folder_name: str, subfolder_name: str):
-        """Search for folder in all stores recursively."""
-        stores = self.namespace.Stores
-        for store in stores:
+        """
+        Search for folder in all stores; the first store (in order) with a match wins.
+
+        With several stores, each is searched by a worker thread with its own
+        Outlook session, so the COM round trips of the stores overlap.
+        """
+        stores = self._get_stores()
+        if len(stores) < 2:
+            for store, root_folder in stores:
+                try:
+                    result = self._search_folder_bfs(root_folder, folder_name, subfolder_name)
+                    if result:
+                        return self._report_search_hit(store, result)
+                except Exception:
+                    continue
+            return None
+
+        # COM objects can't cross threads: workers get IDs and return an ID
+        targets = []
+        for store, root_folder in stores:
             try:
-                root_folder = store.GetRootFolder()
-                result = self._search_folder_recursive(root_folder, folder_name, subfolder_name)
-                if result:
-                    print(f"✅ Carpeta encontrada en: {store.DisplayName}")
-                    print(f"📧 Items encontrados: {result.Items.Count}")
-                    return result
+                targets.append((store, root_folder.EntryID, store.StoreID))
             except Exception:
                 continue
+
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [
+                executor.submit(self._search_store_by_id, root_id, store_id,
+                                folder_name, subfolder_name, stop)
+                for _, root_id, store_id in targets
+            ]
+            # Checked in store order, so the result is the same as a
+            # sequential search; stores after the hit are told to stop
+            for (store, _, store_id), future in zip(targets, futures):
+                try:
+                    entry_id = future.result()
+                except Exception:
+                    continue
+                if entry_id:
+                    stop.set()
+                    result = self.namespace.GetFolderFromID(entry_id, store_id)
+                    return self._report_search_hit(store, result)
         return None
 
-    def _search_folder_recursive(self, parent_folder, folder_name: str,
-                                 subfolder_name: str, depth: int = 0):
-        """Recursively search for folder."""
-        if depth > 5:  # Limit recursion depth
-            return None
+    def _search_store_by_id(self, root_id: str, store_id: str, folder_name: str,
+                            subfolder_name: str, stop: threading.Event):
+        """
+        Search one store in its own Outlook session (worker thread).
 
+        Returns:
+            EntryID of the matching folder, or None
+        """
+        pythoncom.CoInitialize()
         try:
-            folders = parent_folder.Folders
+            namespace = dispatch_outlook().GetNamespace("MAPI")
+            root_folder = namespace.GetFolderFromID(root_id, store_id)
+            result = self._search_folder_bfs(root_folder, folder_name, subfolder_name, stop=stop)
+            return result.EntryID if result else None
+        finally:
+            pythoncom.CoUninitialize()
+
+    def _report_search_hit(self, store, folder):
+        """Print where a searched folder was found and return it."""
+        print(f"✅ Carpeta encontrada en: {store.DisplayName}")
+        print(f"📧 Items encontrados: {self._item_count(folder)}")
+        return folder
+
+    def _search_folder_bfs(self, root_folder, folder_name: str,
+                           subfolder_name: str, max_depth: int = 5,
+                           stop: Optional[threading.Event] = None):
+        """
+        Search for a folder breadth-first, level by level.
+
+        The shallowest match is returned, and wide but shallow mailboxes are
+        not walked to the bottom of every branch before a sibling is checked.
+
+        Args:
+            root_folder: Folder whose subtree is searched
+            folder_name: Name of the folder to find
+            subfolder_name: Optional subfolder that must exist in the match
+            max_depth: Deepest level searched (0 = children of root_folder)
+            stop: Optional event that abandons the search once set
+
+        Returns:
+            Matching folder (or its subfolder), or None
+        """
+        queue = deque([(root_folder, 0)])
+        while queue:
+            if stop is not None and stop.is_set():
+                return None
+            parent_folder, depth = queue.popleft()
+            try:
+                folders = parent_folder.Folders
+            except Exception:
+                continue
+
             for folder in folders:
                 try:
                     if folder.Name == folder_name:
-                        if subfolder_name:
-                            try:
-                                return folder.Folders[subfolder_name]
-                            except Exception:
-                                pass
-                        else:
+                        if not subfolder_name:
                             return folder
+                        try:
+                            return folder.Folders[subfolder_name]
+                        except Exception:
+                            pass
 
-                    # Search in subfolders
-                    result = self._search_folder_recursive(folder, folder_name,
-                                                          subfolder_name, depth + 1)
-                    if result:
-                        return result
+                    if depth < max_depth:
+                        queue.append((folder, depth + 1))
                 except Exception:
                     continue
-        except Exception:
-            pass
 
         return None
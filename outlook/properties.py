@@ -0,0 +1,64 @@
+"""
+Bulk reads of MAPI properties through PropertyAccessor.
+
+Every item property read through the object model (item.Subject,
+item.SenderName...) is a separate cross-process COM call. The properties
+below are fetched with a single PropertyAccessor.GetProperties call instead.
+"""
+
+_PROPTAG = "http://schemas.microsoft.com/mapi/proptag/"
+
+# Extractor field -> DASL name of the MAPI property (Unicode string types).
+# The body is left out (PropertyAccessor can't return large string values)
+# and so is ReceivedTime (MAPI returns it in UTC, the object model in local
+# time).
+HEADER_PROPERTIES = {
+    'subject': _PROPTAG + "0x0037001F",        # PR_SUBJECT_W
+    'sender_name': _PROPTAG + "0x0C1A001F",    # PR_SENDER_NAME_W
+    'sender_email': _PROPTAG + "0x0C1F001F",   # PR_SENDER_EMAIL_ADDRESS_W
+    'to': _PROPTAG + "0x0E04001F",             # PR_DISPLAY_TO_W
+    'cc': _PROPTAG + "0x0E03001F",             # PR_DISPLAY_CC_W
+}
+
+# Folder field -> DASL name of the MAPI property
+FOLDER_PROPERTIES = {
+    'name': _PROPTAG + "0x3001001F",           # PR_DISPLAY_NAME_W
+    'item_count': _PROPTAG + "0x36020003",     # PR_CONTENT_COUNT
+}
+
+
+def read_properties(obj, properties: dict) -> dict:
+    """
+    Read several MAPI properties of an Outlook object in one COM round trip.
+
+    Properties the store couldn't return come back as error codes and are
+    left out, so the caller falls back to the object model for those.
+
+    Args:
+        obj: Outlook item or folder
+        properties: Dict of field -> DASL property name
+
+    Returns:
+        Dict of field -> value (empty if the call itself failed)
+    """
+    try:
+        values = obj.PropertyAccessor.GetProperties(tuple(properties.values()))
+    except Exception:
+        return {}
+
+    # Failed properties come back as a negative HRESULT in place of the value
+    return {
+        field: value
+        for field, value in zip(properties, values)
+        if isinstance(value, str) or (isinstance(value, int) and value >= 0)
+    }
+
+
+def read_header_properties(item) -> dict:
+    """
+    Read the header fields of an Outlook item in one COM round trip.
+
+    Returns:
+        Dict of field -> string value, for the fields in HEADER_PROPERTIES
+    """
+    return read_properties(item, HEADER_PROPERTIES)
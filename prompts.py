@@ -1,20 +1,23 @@
 """
 Prompts and schemas for AI email processing.
 """
+import sys
+from functools import lru_cache
 
 SYSTEM_PROMPT = """You are an expert AI analyst specializing in processing business emails related to water treatment equipment and solutions.
 Your task is to analyze email content and extract structured data in JSON format.
 """
 
-USER_PROMPT_TEMPLATE = """You will be analyzing email data extracted from business correspondence.
+# Preferred product categories; substituted for {PRODUCT_LIST} in USER_PROMPT_TEMPLATE
+PRODUCT_LIST = """Agitadores, Aireadores, Almacenamiento, Arqueta, Asesoramiento, Biodigestor, Biodiscos, Bombas, Canal Parshall, Cavitador CAF, Clarificadores, Colector, Compresor, Compuerta, Compuertas, Contenedor, Cuadro electrico, Cucharas bivalva, Decantador centrífugo, Decantador lamelar, Decantador SBR, Desarenador, Desarenador cicloidal, Desarenador desengrasador, Desbaste, Deshidratación purín, Deshidratador centrifugo, Deshidratador filtro pensa, Desinfección por cloración, Desnatador, Difusores, Equipo para sistema de agua desalinizada, Equipos electromecánicos, Equipos pretratamiento y espesamiento, Estudios, Evaporadaror, Fabricación planta tratamiento, Filtración, Filtro carbon activado, Filtro prensa, Floculador, Floculante, Generador de microburbuja, Generador de Ozono, Instrumentación, Inyector, Mantenimiento, Membranas MBR, Mezclador, Osmosis inversa, Pasamuro, Planta de biogás, Planta de pretratamiento, Planta de pretratamiento compacta, Planta de tratamiento, Planta pilloto, Planta poli, Planta tratamiento compacta, PLC de control, Polipastos, Polymer feed pump, Pozo de bombeos, pressure booster pump, Reja de desbaste, Reja desbaste, Rental and, Repuestos Tornillo deshidratador de lodo, Sacor filtrantes, Separador de grasas, Separador de hidrocarburos, Separador solido liquido, Separadores de lodos ciclónicos, Silo decantador, Sinfin, Sistema CAF, Sistema coagulacion floculación, Sistema DAF, sistema de extracción de lodos, Sistema de medición continua, Sistema de neutralización de gas clorado, Sistema de ultrafiltración, Sistema desalinización, Sistema desodorización, Sistema electroquimico, Sistema FCM, Sistema llenado botellas, Sistema lodos activados, Sistema MBBR, Sistema MBR, Sistema SBR, Soplante, Tamiz compactador, Tamiz de aliviadero, Tamiz rotativo, Tanque de mazcla, Tanque de tormentas, Tolva, Tornillo deshidratador de lodo, Tratamiento biológico, Tratamiento reactores secuenciales, Tratamiento terciario, Tubos, Valvulas, Varios"""
 
-<email_data>
-{EMAIL_DATA}
-</email_data>
+# Everything before {EMAIL_DATA} is identical for every request, so providers
+# that cache prompt prefixes can reuse it; keep per-email content at the end.
+USER_PROMPT_TEMPLATE = """You will be analyzing email data extracted from business correspondence.
 
 **Product Categorization List:**
 When identifying equipment or products, categorize them using items from this preferred list whenever possible:
-Agitadores, Aireadores, Almacenamiento, Arqueta, Asesoramiento, Biodigestor, Biodiscos, Bombas, Canal Parshall, Cavitador CAF, Clarificadores, Colector, Compresor, Compuerta, Compuertas, Contenedor, Cuadro electrico, Cucharas bivalva, Decantador centrífugo, Decantador lamelar, Decantador SBR, Desarenador, Desarenador cicloidal, Desarenador desengrasador, Desbaste, Deshidratación purín, Deshidratador centrifugo, Deshidratador filtro pensa, Desinfección por cloración, Desnatador, Difusores, Equipo para sistema de agua desalinizada, Equipos electromecánicos, Equipos pretratamiento y espesamiento, Estudios, Evaporadaror, Fabricación planta tratamiento, Filtración, Filtro carbon activado, Filtro prensa, Floculador, Floculante, Generador de microburbuja, Generador de Ozono, Instrumentación, Inyector, Mantenimiento, Membranas MBR, Mezclador, Osmosis inversa, Pasamuro, Planta de biogás, Planta de pretratamiento, Planta de pretratamiento compacta, Planta de tratamiento, Planta pilloto, Planta poli, Planta tratamiento compacta, PLC de control, Polipastos, Polymer feed pump, Pozo de bombeos, pressure booster pump, Reja de desbaste, Reja desbaste, Rental and, Repuestos Tornillo deshidratador de lodo, Sacor filtrantes, Separador de grasas, Separador de hidrocarburos, Separador solido liquido, Separadores de lodos ciclónicos, Silo decantador, Sinfin, Sistema CAF, Sistema coagulacion floculación, Sistema DAF, sistema de extracción de lodos, Sistema de medición continua, Sistema de neutralización de gas clorado, Sistema de ultrafiltración, Sistema desalinización, Sistema desodorización, Sistema electroquimico, Sistema FCM, Sistema llenado botellas, Sistema lodos activados, Sistema MBBR, Sistema MBR, Sistema SBR, Soplante, Tamiz compactador, Tamiz de aliviadero, Tamiz rotativo, Tanque de mazcla, Tanque de tormentas, Tolva, Tornillo deshidratador de lodo, Tratamiento biológico, Tratamiento reactores secuenciales, Tratamiento terciario, Tubos, Valvulas, Varios.
+{PRODUCT_LIST}.
 
 **Analysis Instructions:**
 1. Analyze the "Subject" and "Body" to identify if this is a Request for Quotation (RFQ) or product inquiry.
@@ -40,4 +43,113 @@ You must respond with a valid JSON object following this schema:
   "subject_body_correlation": "Brief note on how Subject and Body information align or differ"
 }}
 ```
+
+<email_data>
+{EMAIL_DATA}
+</email_data>
+"""
+
+# Appended to the user prompt when several emails are sent in one request
+MULTI_EMAIL_INSTRUCTIONS = """
+**Multiple Emails:**
+The email data contains several email records, each starting with its own "ID:" line.
+Analyze each record independently and respond with a single JSON object of the form
+{"results": [...]}, where the list holds one object per record following the schema above,
+with "record_id" set to that record's ID.
 """
+
+# Substituted for {PRODUCT_LIST} when processing.local_category_matching is on:
+# the answer is matched to the list locally, so the list itself is not sent
+LOCAL_CATEGORY_NOTE = "a short, generic name for the equipment type (it is matched to the company's category list afterwards)"
+
+# Function tool used instead of a free-form JSON answer when
+# processing.use_tool_schema is on
+ANALYSIS_TOOL_NAME = "record_analysis"
+
+# Substituted for {PRODUCT_LIST} when the list travels as the tool's enum
+TOOL_PRODUCT_LIST_NOTE = f"the allowed values of product_category in the {ANALYSIS_TOOL_NAME} function"
+
+
+@lru_cache(maxsize=16)
+def split_product_list(product_list):
+    """
+    Split a comma-separated product list into unique, stripped categories.
+
+    Cached: the same list is split for every run, tool build and matcher.
+
+    Example:
+        "Bombas, Valvulas, Bombas" -> ("Bombas", "Valvulas")
+    """
+    return tuple(dict.fromkeys(item.strip() for item in product_list.split(",") if item.strip()))
+
+
+# Default categories, parsed once at import: the interned names and a
+# lowercase index of them (in list order) for matching the model's answers
+CATEGORIES_LOWER = {item.lower(): sys.intern(item) for item in split_product_list(PRODUCT_LIST)}
+CATEGORIES = frozenset(CATEGORIES_LOWER.values())
+
+
+@lru_cache(maxsize=16)
+def build_analysis_tool(product_list, multi=False):
+    """
+    Build the function tool matching the JSON output schema above.
+
+    product_category is constrained to the product list (plus 'Other'), so
+    the model decodes against the enum instead of reading the list as text.
+
+    Args:
+        product_list: Comma-separated product categories, or None to leave
+            product_category free (local category matching)
+        multi: Wrap one record per email in a "results" array (several
+            emails per request)
+
+    Returns:
+        Tool definition for chat.completions.create(tools=[...])
+    """
+    text = {"type": "string"}
+    if product_list is None:
+        product_category = text
+    else:
+        categories = list(split_product_list(product_list))
+        if "Other" not in categories:
+            categories.append("Other")
+        product_category = {"type": "string", "enum": categories}
+
+    record = {
+        "type": "object",
+        "properties": {
+            "record_id": text,
+            "company_info": {
+                "type": "object",
+                "properties": {"name": text, "website": text, "country": text},
+                "required": ["name", "website", "country"],
+            },
+            "email_category": {"type": "string", "enum": ["Solución de tratamiento compleja", "Productos"]},
+            "product_category": product_category,
+            "equipment_requested": text,
+            "technical_specifications": text,
+            "subject_body_correlation": text,
+        },
+        "required": [
+            "record_id", "company_info", "email_category", "product_category",
+            "equipment_requested", "technical_specifications", "subject_body_correlation",
+        ],
+    }
+
+    if multi:
+        parameters = {
+            "type": "object",
+            "properties": {"results": {"type": "array", "items": record}},
+            "required": ["results"],
+        }
+    else:
+        parameters = record
+
+    return {
+        "type": "function",
+        "function": {
+            "name": ANALYSIS_TOOL_NAME,
+            "description": "Record the analysis of the email data.",
+            "parameters": parameters,
+        },
+    }
@@ -2,9 +2,11 @@
 Outlook Folder Explorer
 Shows your Outlook folder structure to help configure the workflow correctly.
 """
-import win32com.client
 import sys
 
+from outlook.connector import dispatch_outlook
+from outlook.properties import FOLDER_PROPERTIES, read_properties
+
 
 def explore_outlook_folders():
     """Explore and display Outlook folder structure."""
@@ -16,7 +18,7 @@ def explore_outlook_folders():
     try:
         # Connect to Outlook
         print("Connecting to Outlook...")
-        outlook = win32com.client.Dispatch("Outlook.Application")
+        outlook = dispatch_outlook()
         namespace = outlook.GetNamespace("MAPI")
         print("✅ Connected to Outlook successfully!\n")
 
@@ -25,14 +27,18 @@ def explore_outlook_folders():
         print("YOUR OUTLOOK ACCOUNTS:")
         print("=" * 70)
 
-        stores = namespace.Stores
+        # Enumerated once; each store's root folder is opened only once and
+        # only for stores that are already open (offline PSTs are not forced open)
+        stores = list(namespace.Stores)
+        roots = {}
         for i, store in enumerate(stores, 1):
             print(f"\n{i}. {store.DisplayName}")
             try:
-                # Try to get email address if available
-                if hasattr(store, 'GetRootFolder'):
-                    root = store.GetRootFolder()
-                    print(f"   Root folder: {root.Name}")
+                if not store.IsOpen:
+                    print("   (not open, skipped)")
+                    continue
+                roots[i] = store.GetRootFolder()
+                print(f"   Root folder: {roots[i].Name}")
             except Exception:
                 pass
 
@@ -41,15 +47,14 @@ def explore_outlook_folders():
         print("=" * 70)
 
         # Explore each store's folders
-        for store in stores:
+        for i, store in enumerate(stores, 1):
             print(f"\n📧 Account: {store.DisplayName}")
             print("-" * 70)
 
-            try:
-                root_folder = store.GetRootFolder()
-                explore_folder(root_folder, indent=0)
-            except Exception as e:
-                print(f"   ❌ Could not access folders: {e}")
+            if i not in roots:
+                print("   ❌ Could not access folders")
+                continue
+            explore_folder(roots[i], indent=0)
 
         print("\n" + "=" * 70)
         print("CONFIGURATION HELP:")
@@ -86,10 +91,12 @@ def explore_folder(folder, indent=0):
     prefix = "  " * indent
 
     try:
-        # Get folder info
-        folder_name = folder.Name
+        # Get folder info (name and item count in one round trip when the
+        # store supports it)
+        props = read_properties(folder, FOLDER_PROPERTIES)
+        folder_name = props.get('name') or folder.Name
         try:
-            item_count = folder.Items.Count
+            item_count = props['item_count'] if 'item_count' in props else folder.Items.Count
             folder_info = f"{folder_name} ({item_count} items)"
         except Exception:
             folder_info = f"{folder_name}"
@@ -103,7 +110,7 @@ def explore_folder(folder, indent=0):
         # Explore subfolders (limit depth to avoid too much output)
         if indent < 3:
             try:
-                subfolders = folder.Folders
+                subfolders = list(folder.Folders)
                 for subfolder in subfolders:
                     try:
                         explore_folder(subfolder, indent + 1)
@@ -0,0 +1,40 @@
+import importlib
+import os
+import shutil
+import sys
+import types
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tests import the top-level modules the way the scripts do (run from the repo root)
+sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture
+def extractor_module(tmp_path, monkeypatch):
+    """
+    Import extractor.py off Windows, configured from the template.
+
+    pywin32 only exists on Windows; the tests using this fixture never talk
+    to Outlook, so empty pythoncom / win32com.client modules are enough.
+    """
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(os.path.join(REPO_DIR, 'workflow_config.yaml.template'),
+                tmp_path / 'workflow_config.yaml')
+
+    win32com = types.ModuleType('win32com')
+    win32com.client = types.ModuleType('win32com.client')
+    monkeypatch.setitem(sys.modules, 'pythoncom', types.ModuleType('pythoncom'))
+    monkeypatch.setitem(sys.modules, 'win32com', win32com)
+    monkeypatch.setitem(sys.modules, 'win32com.client', win32com.client)
+
+    import config_loader
+    monkeypatch.setattr(config_loader, '_config_instance', None)
+    for name in ('config', 'outlook.connector', 'extractor'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    module = importlib.import_module('extractor')
+    monkeypatch.setattr(module, 'OUTPUT_DIR', str(tmp_path / 'outputs'))
+    return module
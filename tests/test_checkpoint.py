@@ -0,0 +1,15 @@
+from utils.checkpoint import ChunkCheckpoint
+
+
+def test_resumed_chunk_matches_fresh_chunk(tmp_path):
+    columns = {
+        'record_id': [7, '8', None],
+        'company_info': ['Acme', None, 'Ñandú S.L.'],
+        'confidence': [0.9, None, 1],
+    }
+    checkpoint = ChunkCheckpoint(str(tmp_path / 'run'))
+    checkpoint.save(0, columns)
+
+    assert checkpoint.load(0, 3) == columns
+    assert checkpoint.load(0, 2) is None
+    assert checkpoint.load(3, 3) is None
@@ -0,0 +1,59 @@
+"""Tests for the files written by the extractor."""
+import os
+
+import pandas as pd
+
+from models import EmailData, ExcludedEmail, Location, ProcessingError
+
+
+def _sample_results():
+    results = [
+        EmailData(from_name=f"Cliente {i}", from_email=f"c{i}@example.com", to="ventas@example.com",
+                  date=f"2024-01-0{i + 1} 10:00:00", subject=f"RFQ {i}", body=f"Cuerpo {i}",
+                  attachments="oferta.pdf", location=Location(city="Madrid", country="España"))
+        for i in range(3)
+    ]
+    excluded = [
+        ExcludedEmail(from_name=f"Boletín {i}", from_email=f"n{i}@example.com", subject=f"News {i}",
+                      body=f"Texto {i}", exclusion_reason="Newsletter")
+        for i in range(2)
+    ]
+    errors = [ProcessingError(error=f"Error {i}", subject=f"Asunto {i}", date="2024-01-01") for i in range(2)]
+    return results, excluded, errors
+
+
+def test_save_results_workbooks_read_back(extractor_module):
+    processor = extractor_module.EmailProcessor()
+    results, excluded, errors = _sample_results()
+
+    output_path, df = processor._save_results(results, excluded, errors)
+
+    saved = pd.read_excel(output_path, keep_default_na=False)
+    expected = pd.DataFrame(EmailData.to_columns(results))
+    assert list(saved.columns) == list(expected.columns)
+    for col in ('From_Name', 'From_Email', 'Subject', 'Body', 'Location'):
+        assert saved[col].tolist() == expected[col].tolist()
+    assert len(df) == len(results)
+
+    output_dir = os.path.dirname(output_path)
+    saved_excluded = pd.read_excel(os.path.join(output_dir, processor.excluded_filename))
+    assert saved_excluded['Subject'].tolist() == ['News 0', 'News 1']
+    assert saved_excluded['Exclusion_Reason'].tolist() == ['Newsletter', 'Newsletter']
+
+    saved_errors = pd.read_excel(os.path.join(output_dir, processor.errors_filename))
+    assert saved_errors['Error'].tolist() == ['Error 0', 'Error 1']
+    assert saved_errors['Subject'].tolist() == ['Asunto 0', 'Asunto 1']
+
+
+def test_save_results_sidecar_is_preferred(extractor_module, monkeypatch):
+    from utils.io_utils import fast_io_path, resolve_fast_io_path
+
+    monkeypatch.setattr(extractor_module, 'FAST_IO', True)
+    processor = extractor_module.EmailProcessor()
+    results, excluded, errors = _sample_results()
+
+    output_path, _ = processor._save_results(results, excluded, errors)
+
+    assert resolve_fast_io_path(output_path) == fast_io_path(output_path)
+    sidecar = pd.read_feather(fast_io_path(output_path))
+    assert sidecar['Subject'].tolist() == ['RFQ 0', 'RFQ 1', 'RFQ 2']
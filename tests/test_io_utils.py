@@ -0,0 +1,42 @@
+"""Tests for the intermediate table I/O helpers."""
+from datetime import datetime
+
+import pandas as pd
+
+from utils.io_utils import write_excel
+
+
+def test_write_excel_round_trip_keeps_every_cell(tmp_path):
+    df = pd.DataFrame({
+        'From_Name': ['Ana', 'Luis', 'Marta'],
+        'Subject': ['RFQ bombas', '=not a formula', 'Cotización'],
+        'Body': ['texto 1', None, 'texto 3'],
+        'Attachments': [0, 2, 1],
+        'Score': [1.5, float('nan'), 2.0],
+        'Received': [datetime(2024, 1, 2, 3, 4, 5)] * 3,
+    })
+    path = tmp_path / 'emails.xlsx'
+
+    write_excel(df, str(path))
+    back = pd.read_excel(path)
+
+    assert list(back.columns) == list(df.columns)
+    assert len(back) == len(df)
+    assert back['From_Name'].tolist() == ['Ana', 'Luis', 'Marta']
+    assert back['Subject'].tolist() == ['RFQ bombas', '=not a formula', 'Cotización']
+    assert back['Body'].tolist()[0] == 'texto 1'
+    assert pd.isna(back['Body'][1])
+    assert back['Body'].tolist()[2] == 'texto 3'
+    assert back['Attachments'].tolist() == [0, 2, 1]
+    assert back['Score'][0] == 1.5 and pd.isna(back['Score'][1])
+    assert back['Received'].tolist() == [pd.Timestamp(2024, 1, 2, 3, 4, 5)] * 3
+
+
+def test_write_excel_empty_frame_keeps_header(tmp_path):
+    path = tmp_path / 'empty.xlsx'
+
+    write_excel(pd.DataFrame(columns=['A', 'B']), str(path))
+
+    back = pd.read_excel(path)
+    assert list(back.columns) == ['A', 'B']
+    assert back.empty
@@ -0,0 +1,41 @@
+"""Tests for the processed-emails workbook written after the AI analysis."""
+import json
+
+import pandas as pd
+
+from email_processing import (
+    EMAIL_FIELDS, PARSED_FIELDS, attach_parsed_columns, new_parsed_columns, parse_json, store_parsed
+)
+from utils.io_utils import compact_dtypes, write_excel
+
+
+def _response(i):
+    return json.dumps({
+        "record_id": i + 1,
+        "company_info": {"name": f"Empresa {i}", "website": f"https://e{i}.example.com", "country": "Chile"},
+        "email_category": "RFQ",
+        "product_category": "Bombas",
+        "equipment_requested": f"Bomba {i}",
+        "technical_specifications": f"{10 * (i + 1)} m3/h",
+        "subject_body_correlation": "High",
+    })
+
+
+def test_processed_workbook_keeps_parsed_columns_for_every_row(tmp_path):
+    rows = 4
+    df = compact_dtypes(pd.DataFrame({field: [f"{field} {i}" for i in range(rows)] for field in EMAIL_FIELDS}))
+    columns = new_parsed_columns(rows)
+    for i in range(rows):
+        store_parsed(columns, i, parse_json(_response(i)))
+    df_final = attach_parsed_columns(df, columns)
+    path = tmp_path / 'emails_processed.xlsx'
+
+    write_excel(df_final, str(path))
+    back = pd.read_excel(path)
+
+    assert list(back.columns) == list(EMAIL_FIELDS) + list(PARSED_FIELDS)
+    assert back['Subject'].tolist() == [f"Subject {i}" for i in range(rows)]
+    assert back['record_id'].tolist() == [1, 2, 3, 4]
+    assert back['company_name'].tolist() == [f"Empresa {i}" for i in range(rows)]
+    assert back['equipment_requested'].tolist() == [f"Bomba {i}" for i in range(rows)]
+    assert back['product_category'].tolist() == ["Bombas"] * rows
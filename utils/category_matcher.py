@@ -0,0 +1,94 @@
+"""
+Local matching of free-form product categories to the product list.
+
+With processing.local_category_matching on, the product list is not sent
+with every request: the model names a category freely and the answer is
+snapped to the closest entry of the list here. Fuzzy matching uses the
+optional rapidfuzz package, with difflib from the standard library as the
+fallback.
+"""
+import difflib
+from functools import lru_cache
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+# Answers that are not category names and are kept as they are
+PASSTHROUGH_VALUES = frozenset({"Other", "Error", "Not specified"})
+
+
+class CategoryMatcher:
+    """Snaps category names to the closest entry of a fixed list."""
+
+    def __init__(self, categories, score_cutoff: int = 80, by_lower=None):
+        """
+        Args:
+            categories: Allowed category names
+            score_cutoff: Minimum similarity (0-100) for a fuzzy match;
+                weaker matches become 'Other'
+            by_lower: Prebuilt {name.lower(): name} index of the categories
+                (as prompts.CATEGORIES_LOWER), built here when omitted
+        """
+        if by_lower is None:
+            by_lower = {category.lower(): category for category in categories}
+        self._by_lower = by_lower
+        # Taken from the index, so fuzzy ties resolve in list order
+        self.categories = tuple(by_lower.values())
+        self._names = frozenset(categories)
+        self.score_cutoff = score_cutoff
+        # Model answers repeat a lot; each distinct one is matched once
+        self._snapped = {}
+
+    def snap(self, value):
+        """
+        Return the list entry closest to value, or 'Other' if none is close.
+
+        Example:
+            snap("bombas dosificadoras") -> "Bombas"
+        """
+        if not isinstance(value, str) or value in PASSTHROUGH_VALUES or value in self._names:
+            return value
+
+        snapped = self._snapped.get(value)
+        if snapped is None:
+            snapped = self._snapped[value] = self._match(value.strip())
+        return snapped
+
+    def _match(self, value: str) -> str:
+        exact = self._by_lower.get(value.lower())
+        if exact is not None:
+            return exact
+
+        if process is not None:
+            match = process.extractOne(
+                value, self.categories, scorer=fuzz.WRatio,
+                processor=str.lower, score_cutoff=self.score_cutoff
+            )
+            return match[0] if match else "Other"
+
+        matches = difflib.get_close_matches(
+            value.lower(), self._by_lower, n=1, cutoff=self.score_cutoff / 100
+        )
+        return self._by_lower[matches[0]] if matches else "Other"
+
+
+@lru_cache(maxsize=16)
+def get_category_matcher(categories: tuple) -> CategoryMatcher:
+    """
+    Get the shared matcher of a category list.
+
+    Matchers (and the answers they have already matched) are kept for the
+    life of the process, so a new run with the same list, e.g. from the app,
+    starts with a warm index.
+    """
+    return CategoryMatcher(categories)
+
+
+@lru_cache(maxsize=1)
+def get_default_category_matcher() -> CategoryMatcher:
+    """Get the shared matcher of the default product list, from the index parsed in prompts."""
+    from prompts import CATEGORIES, CATEGORIES_LOWER
+
+    return CategoryMatcher(CATEGORIES, by_lower=CATEGORIES_LOWER)
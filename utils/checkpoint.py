@@ -0,0 +1,94 @@
+"""
+Chunk checkpoints for long AI processing runs.
+
+Every finished chunk of parsed results is written to its own small Parquet
+file, so a crash or an interrupted run only loses the chunk that was in
+flight. A single growing Parquet file would not survive a crash: its footer
+is only written when the writer is closed.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+
+class ChunkCheckpoint:
+    """Directory of per-chunk Parquet files for one processing run."""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Folder holding the part files (created if missing)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def for_run(cls, output_path: str, *fingerprint) -> "ChunkCheckpoint":
+        """
+        Get the checkpoint of a run, identified by its output file and inputs.
+
+        Any change in the fingerprint (input file, its modification time, the
+        model or the prompt...) selects a fresh directory, so stale results
+        are never reused.
+
+        Example:
+            ChunkCheckpoint.for_run("outputs/emails_processed.xlsx", input_path, mtime, model)
+            -> outputs/.checkpoints/emails_processed-3f2a9c0d1e7b4a65/
+        """
+        digest = hashlib.blake2b(repr(fingerprint).encode('utf-8'), digest_size=8).hexdigest()
+        stem = os.path.splitext(os.path.basename(output_path))[0]
+        base = os.path.join(os.path.dirname(output_path), '.checkpoints')
+        return cls(os.path.join(base, f"{stem}-{digest}"))
+
+    def _part_path(self, start: int) -> str:
+        return os.path.join(self.directory, f"part-{start:09d}.parquet")
+
+    def load(self, start: int, length: int):
+        """
+        Load the saved columns of the chunk starting at row `start`.
+
+        Args:
+            start: Position of the chunk's first row
+            length: Expected number of rows in the chunk
+
+        Returns:
+            Dict of column -> list of values, or None if there is no usable part
+        """
+        path = self._part_path(start)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            part = pd.read_parquet(path)
+        except Exception:
+            return None
+
+        if len(part) != length:
+            return None
+        return {col: [json.loads(value) for value in part[col]] for col in part.columns}
+
+    def save(self, start: int, columns: dict) -> None:
+        """
+        Save the columns of the chunk starting at row `start`.
+
+        The part is written under a temporary name and renamed, so a crash
+        mid-write never leaves a truncated part behind.
+        """
+        # Each value is stored as its JSON text: answers mix types within a
+        # column (e.g. record_id), which Arrow can't hold, and load() then
+        # gives back the same values (None, ints...) as a freshly parsed chunk
+        part = pd.DataFrame({
+            col: [json.dumps(value, ensure_ascii=False, default=str) for value in values]
+            for col, values in columns.items()
+        })
+        path = self._part_path(start)
+        tmp_path = path + '.tmp'
+        part.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Delete the checkpoint once the final output has been written."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,65 @@
+"""
+Console utility functions for the interactive workflow prompts.
+"""
+import sys
+import time
+from typing import Optional
+
+
+def input_with_timeout(prompt: str, timeout: Optional[float]) -> Optional[str]:
+    """
+    Read one line from the console, giving up after `timeout` seconds.
+
+    Uses msvcrt keyboard polling on a Windows console and select() on stdin
+    elsewhere (which also covers piped input). Piped input on Windows is read
+    without a timeout: the pipe ends with EOF anyway.
+
+    Args:
+        prompt: Text shown before reading
+        timeout: Seconds to wait for the answer (None or 0 waits forever)
+
+    Returns:
+        The line typed (without the newline), or None if the time ran out
+
+    Raises:
+        EOFError: stdin was closed before a line was read, as with input()
+    """
+    if not timeout or (sys.platform == 'win32' and not sys.stdin.isatty()):
+        return input(prompt)
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+
+    if sys.platform == 'win32':
+        import msvcrt
+
+        deadline = time.monotonic() + timeout
+        chars = []
+        while time.monotonic() < deadline:
+            if not msvcrt.kbhit():
+                time.sleep(0.05)
+                continue
+            char = msvcrt.getwche()
+            if char in ('\r', '\n'):
+                sys.stdout.write('\n')
+                return ''.join(chars)
+            if char == '\b':
+                if chars:
+                    chars.pop()
+                    sys.stdout.write(' \b')
+            else:
+                chars.append(char)
+        sys.stdout.write('\n')
+        return None
+
+    import select
+
+    ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    if not ready:
+        sys.stdout.write('\n')
+        return None
+
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
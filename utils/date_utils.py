@@ -1,9 +1,12 @@
 """
 Date utility functions for email processing.
 """
-from datetime import datetime
-from typing import Optional
-from dateutil import parser
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Outlook item date properties, in order of preference for filtering
+DATE_PROPERTIES = ('ReceivedTime', 'SentOn', 'CreationTime')
 
 
 def normalize_datetime(dt: datetime) -> datetime:
@@ -26,9 +29,29 @@ def normalize_datetime(dt: datetime) -> datetime:
     return dt
 
 
+def format_datetime(dt: datetime) -> str:
+    """
+    Format a datetime as 'YYYY-MM-DD HH:MM:SS'.
+
+    Equivalent to dt.strftime('%Y-%m-%d %H:%M:%S'), but built from the fields
+    directly instead of going through the C library's strftime, which is
+    noticeably slower for a fixed format called once per email.
+
+    Args:
+        dt: datetime object (e.g. an Outlook ReceivedTime)
+
+    Returns:
+        Formatted date string
+    """
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}")
+
+
+@lru_cache(maxsize=256)
 def parse_date(date_str: str) -> Optional[datetime]:
     """
     Parse date string in various formats.
+    Results are cached, since the same few strings are parsed on every run.
 
     Supported formats:
     - YYYY-MM-DD
@@ -44,29 +67,28 @@ def parse_date(date_str: str) -> Optional[datetime]:
     if not date_str:
         return None
 
-    try:
-        # Try ISO format first (YYYY-MM-DD)
-        dt = datetime.strptime(date_str, '%Y-%m-%d')
-        return normalize_datetime(dt)
-    except ValueError:
-        pass
+    # The separator tells the three supported formats apart, so only the
+    # matching one is tried
+    if len(date_str) > 4 and date_str[4] == '-' and date_str[:4].isdigit():
+        fmt = '%Y-%m-%d'
+    elif '/' in date_str:
+        fmt = '%d/%m/%Y'
+    elif '-' in date_str:
+        fmt = '%d-%m-%Y'
+    else:
+        fmt = None
+
+    if fmt:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+            return normalize_datetime(dt)
+        except ValueError:
+            pass
 
     try:
-        # Try DD/MM/YYYY
-        dt = datetime.strptime(date_str, '%d/%m/%Y')
-        return normalize_datetime(dt)
-    except ValueError:
-        pass
-
-    try:
-        # Try DD-MM-YYYY
-        dt = datetime.strptime(date_str, '%d-%m-%Y')
-        return normalize_datetime(dt)
-    except ValueError:
-        pass
-
-    try:
-        # Try using dateutil parser as fallback
+        # Try using dateutil parser as fallback (imported here: it is slow to
+        # import and the formats above cover almost every input)
+        from dateutil import parser
         dt = parser.parse(date_str, dayfirst=True)
         return normalize_datetime(dt)
     except Exception:
@@ -75,36 +97,115 @@ def parse_date(date_str: str) -> Optional[datetime]:
         return None
 
 
-def get_date_for_filtering(email) -> Optional[datetime]:
+def get_date_for_filtering(email, received_time: Optional[datetime] = None) -> Optional[datetime]:
     """
     Get date from email for filtering purposes.
     Tries multiple date fields and normalizes to timezone-naive.
 
     Args:
         email: Outlook email object
+        received_time: ReceivedTime already read from the email (optional)
 
     Returns:
         Timezone-naive datetime object or None if no date found
     """
-    # Try ReceivedTime first
-    try:
-        if hasattr(email, 'ReceivedTime') and email.ReceivedTime:
-            return normalize_datetime(email.ReceivedTime)
-    except Exception:
-        pass
+    if received_time:
+        return normalize_datetime(received_time)
+
+    # Try ReceivedTime first, then SentOn, then CreationTime. Each property is
+    # read directly: a hasattr() probe would cost a second COM call
+    for name in DATE_PROPERTIES:
+        try:
+            value = getattr(email, name, None)
+            if value:
+                return normalize_datetime(value)
+        except Exception:
+            continue
 
-    # Try SentOn
-    try:
-        if hasattr(email, 'SentOn') and email.SentOn:
-            return normalize_datetime(email.SentOn)
-    except Exception:
-        pass
+    return None
 
-    # Try CreationTime
-    try:
-        if hasattr(email, 'CreationTime') and email.CreationTime:
-            return normalize_datetime(email.CreationTime)
-    except Exception:
-        pass
 
-    return None
+def split_date_range(
+    start_date: datetime,
+    end_date: datetime,
+    parts: int
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split a date range into consecutive windows aligned to whole days.
+
+    Each window is (start, end) with the start inclusive and the end exclusive,
+    except the last one, which ends exactly at end_date.
+
+    Args:
+        start_date: Start of the range
+        end_date: End of the range
+        parts: Maximum number of windows
+
+    Returns:
+        List of (window_start, window_end) tuples in chronological order
+    """
+    days = max((end_date - start_date).days, 1)
+    step = timedelta(days=-(-days // max(parts, 1)))
+
+    windows = []
+    window_start = start_date
+    while window_start < end_date:
+        window_end = min(window_start + step, end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end
+
+    return windows or [(start_date, end_date)]
+
+
+def outlook_date_restriction(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    end_inclusive: bool = True,
+    include_undated: bool = True
+) -> str:
+    """
+    Build an Outlook Items.Restrict filter on the received date.
+
+    A DASL filter is used instead of a Jet one ("[ReceivedTime] >= ..."):
+    Jet date strings are parsed in the system locale (month/day order, AM/PM
+    marker), which silently breaks on Spanish or other day-first systems.
+    DASL compares in UTC, so the local dates are converted, and written
+    year-first in 24-hour time, which no locale reads differently.
+
+    Example:
+        @SQL=("urn:schemas:httpmail:datereceived" >= '2024-01-31 05:00'
+              AND "urn:schemas:httpmail:datereceived" <= '2024-02-29 05:00')
+             OR "urn:schemas:httpmail:datereceived" IS NULL
+
+    Args:
+        start_date: Optional start date, local time (inclusive)
+        end_date: Optional end date, local time
+        end_inclusive: Whether end_date itself is part of the range
+        include_undated: Keep items without a received date, so the caller
+            can check them against SentOn/CreationTime instead
+
+    Returns:
+        Restriction string (empty if no dates are given)
+    """
+    prop = '"urn:schemas:httpmail:datereceived"'
+    clauses = []
+    if start_date:
+        clauses.append(f"{prop} >= '{_dasl_utc(start_date)}'")
+    if end_date:
+        operator = '<=' if end_inclusive else '<'
+        clauses.append(f"{prop} {operator} '{_dasl_utc(end_date)}'")
+    if not clauses:
+        return ""
+
+    condition = " AND ".join(clauses)
+    if include_undated:
+        condition = f"({condition}) OR {prop} IS NULL"
+    return "@SQL=" + condition
+
+
+def _dasl_utc(dt: datetime) -> str:
+    """Format a local datetime as a UTC DASL date literal."""
+    if dt.tzinfo is None:
+        # Naive datetimes are local time (what Outlook shows the user)
+        dt = dt.astimezone()
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M')
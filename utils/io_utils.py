@@ -0,0 +1,283 @@
+"""
+I/O utility functions for the intermediate email tables.
+
+The Excel files are the human-facing artifacts; a columnar Feather sidecar
+next to them is used for the machine-to-machine handoff between steps.
+"""
+import hashlib
+import os
+from typing import List, Tuple
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+    EXCEL_WRITE_ENGINE = 'xlsxwriter'
+except ImportError:
+    EXCEL_WRITE_ENGINE = None
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READ_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_READ_ENGINE = None
+
+# Extracted-email columns with many repeated values (stored as categoricals)
+CATEGORY_COLUMNS = ('From_Name', 'From_Email', 'Location', 'Error_Tags')
+
+# Long free-text columns (stored as Arrow-backed strings)
+STRING_COLUMNS = ('Subject', 'Body')
+
+
+def fast_io_path(path: str) -> str:
+    """
+    Get the Feather sidecar path for a table file.
+
+    Example:
+        "outputs/emails.xlsx" -> "outputs/emails.feather"
+    """
+    return os.path.splitext(path)[0] + '.feather'
+
+
+def resolve_fast_io_path(path: str) -> str:
+    """
+    Prefer the Feather sidecar of an Excel file when it is up to date.
+
+    The sidecar is only used when it is at least as recent as the Excel file,
+    so manual edits made to the workbook during review are never ignored.
+
+    Args:
+        path: Path to the Excel (or already columnar) file
+
+    Returns:
+        Path of the file that should be read
+    """
+    sidecar = fast_io_path(path)
+    if sidecar == path or not os.path.exists(sidecar):
+        return path
+
+    try:
+        if os.path.getmtime(sidecar) >= os.path.getmtime(path):
+            return sidecar
+    except OSError:
+        pass
+
+    return path
+
+
+def read_table(path: str, columns=None) -> pd.DataFrame:
+    """
+    Read a table file, choosing the reader from its extension.
+
+    Excel files are read with the Rust-based calamine engine when
+    python-calamine is installed, and with the pandas default otherwise.
+    CSV text is loaded as Arrow-backed strings.
+
+    Args:
+        path: Path to a .feather, .parquet, .csv or Excel file
+        columns: Optional list of columns to load (the others are never parsed)
+
+    Returns:
+        Loaded DataFrame
+    """
+    columns = list(columns) if columns is not None else None
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.feather':
+        return pd.read_feather(path, columns=columns)
+    if ext == '.parquet':
+        return pd.read_parquet(path, engine='pyarrow', columns=columns)
+    if ext == '.csv':
+        return pd.read_csv(path, usecols=columns, dtype='string[pyarrow]')
+    return pd.read_excel(path, engine=EXCEL_READ_ENGINE, usecols=columns)
+
+
+def read_excel_layout(path: str) -> Tuple[List[str], int]:
+    """
+    Read the header and the data row count of the first sheet of a workbook.
+
+    The workbook is opened in openpyxl's read-only mode: only the header row
+    is parsed and the count comes from the sheet's stored dimensions. Sheets
+    written without dimensions are counted in one streaming pass instead.
+
+    Args:
+        path: Path to an .xlsx file
+
+    Returns:
+        Tuple of (column names, number of rows below the header)
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        header = next(ws.iter_rows(max_row=1, values_only=True), ())
+        columns = [str(name) for name in header if name is not None]
+
+        rows = ws.max_row
+        if rows is None:
+            rows = sum(1 for _ in ws.iter_rows(values_only=True))
+        return columns, max(rows - 1, 0)
+    finally:
+        wb.close()
+
+
+def read_table_layout(path: str) -> Tuple[List[str], int]:
+    """
+    Read the column names and the row count of a table file.
+
+    Columnar files answer from their metadata (the Arrow schema and record
+    batch lengths of a memory-mapped Feather file, or the Parquet footer),
+    so no cell is decoded. Excel files go through read_excel_layout.
+
+    Args:
+        path: Path to a .feather, .parquet or Excel file
+
+    Returns:
+        Tuple of (column names, number of data rows)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.feather':
+        import pyarrow as pa
+        import pyarrow.ipc
+
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+            return list(reader.schema.names), rows
+    if ext == '.parquet':
+        import pyarrow.parquet as pq
+
+        metadata = pq.ParquetFile(path).metadata
+        return list(metadata.schema.to_arrow_schema().names), metadata.num_rows
+    return read_excel_layout(path)
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the memory footprint of an extracted-emails frame in place.
+
+    Repeating text columns become categoricals, long text columns become
+    Arrow-backed strings and integer columns are downcast.
+
+    Args:
+        df: DataFrame of extracted emails
+
+    Returns:
+        The same DataFrame, for chaining
+    """
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    for col in STRING_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('string[pyarrow]')
+
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+
+    return df
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Hash the contents of a DataFrame.
+
+    Stands in for the path and modification time of an input file when the
+    table was handed over in memory, so checkpoints still match across runs
+    that extract the same emails.
+
+    Returns:
+        Hex digest of the column names and cell values
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=8)
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast object columns to strings so mixed cell types don't break Arrow."""
+    object_cols = [col for col in df.columns if df[col].dtype == object]
+    if object_cols:
+        df = df.astype({col: 'string' for col in object_cols})
+    return df.reset_index(drop=True)
+
+
+def write_excel(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a DataFrame to Excel, values only.
+
+    With xlsxwriter available the sheet is written row by row in its
+    constant_memory mode, which flushes each row to disk once the next one
+    starts (and skips the per-cell style handling of the default openpyxl
+    writer). The rows are written here rather than through df.to_excel:
+    pandas writes column by column, which constant_memory can't take.
+
+    Args:
+        df: DataFrame to write
+        path: Destination .xlsx path
+    """
+    if EXCEL_WRITE_ENGINE is None:
+        df.to_excel(path, index=False)
+        return
+
+    options = {
+        'constant_memory': True,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    }
+    workbook = xlsxwriter.Workbook(path, options)
+    try:
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, [str(col) for col in df.columns])
+
+        # tolist() gives Python scalars, which xlsxwriter knows how to write
+        columns = [df[col].tolist() for col in df.columns]
+        for row_idx, row in enumerate(zip(*columns), 1):
+            worksheet.write_row(row_idx, 0, [_excel_value(value) for value in row])
+    finally:
+        workbook.close()
+
+
+def _excel_value(value):
+    """Map missing values (None, NaN, NA, NaT) to a blank cell."""
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+def write_parquet_twin(df: pd.DataFrame, path: str) -> str:
+    """
+    Write a zstd-compressed Parquet copy of a table next to its Excel file.
+
+    Args:
+        df: DataFrame that was written to the Excel file
+        path: Path of the Excel file
+
+    Returns:
+        Path of the written Parquet file
+    """
+    twin = os.path.splitext(path)[0] + '.parquet'
+    _arrow_safe(df).to_parquet(twin, compression='zstd')
+    return twin
+
+
+def write_fast_io_sidecar(df: pd.DataFrame, path: str) -> str:
+    """
+    Write the Feather sidecar for an Excel file.
+
+    Args:
+        df: DataFrame that was written to the Excel file
+        path: Path of the Excel file
+
+    Returns:
+        Path of the written sidecar
+    """
+    sidecar = fast_io_path(path)
+    _arrow_safe(df).to_feather(sidecar)
+    return sidecar
@@ -0,0 +1,31 @@
+"""
+JSON helpers backed by orjson when it is installed.
+
+orjson is several times faster than the stdlib for both decoding and
+encoding; the stdlib fallbacks are configured to produce the same text
+(compact separators, UTF-8 kept as-is) so output never depends on which
+one is in use.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    # catch the same exception either way
+    json_loads = orjson.loads
+
+    def json_dumps(obj, sort_keys: bool = False) -> str:
+        """Serialize obj to compact JSON text."""
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(obj, option=option).decode('utf-8')
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj, sort_keys: bool = False) -> str:
+        """Serialize obj to compact JSON text."""
+        return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,67 @@
+"""
+Persistent cache of AI responses.
+
+Requests are sent with temperature 0, so an identical request (same model,
+prompts and token limit) can be answered from disk instead of calling the API
+again. Entries live in a single SQLite file, so no extra dependency is needed.
+"""
+import hashlib
+import os
+import sqlite3
+
+from utils.json_utils import json_dumps
+
+
+def cache_key(**parts) -> str:
+    """
+    Build a stable SHA-256 key from the parts that define a request.
+
+    Example:
+        cache_key(m="openai/gpt-4o-mini", p="...", t=0, mx=700)
+    """
+    payload = json_dumps(parts, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Exact-match key/value store for AI responses, backed by SQLite."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: Path of the SQLite file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        # Accessed only from the event loop thread, but that thread may not be
+        # the one that created the processor
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        """Return the cached response for `key`, or None."""
+        row = self._conn.execute(
+            "SELECT content FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, content: str) -> None:
+        """Store a response under `key`."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, content) VALUES (?, ?)", (key, content)
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -3,6 +3,19 @@ Text utility functions for email processing.
 """
 import re
 
+# Start of a quoted earlier message in a reply. Extracted bodies have their
+# line breaks collapsed to spaces, so the markers are matched inline.
+QUOTED_REPLY_PATTERN = re.compile(
+    r'\s(?:-{3,}\s*(?:Original Message|Mensaje original)\s*-{3,}'
+    r'|On .{1,200}? wrote:'
+    r'|El .{1,200}? escribió:)',
+    re.IGNORECASE
+)
+
+# Patterns used once per email, compiled once at import
+ANGLE_ADDRESS_PATTERN = re.compile(r'<([^>]+)>')
+EMAIL_ADDRESS_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+
 
 def clean_body_text(body: str, max_length: int = 5000) -> str:
     """
@@ -18,11 +31,9 @@ def clean_body_text(body: str, max_length: int = 5000) -> str:
     if not body:
         return ""
 
-    # Remove excessive whitespace
-    body = re.sub(r'\s+', ' ', body)
-
-    # Remove common email artifacts
-    body = re.sub(r'(\r\n|\r|\n)+', ' ', body)
+    # Collapse whitespace, line breaks included, in a single C-level pass
+    # (several times faster than a regex substitution)
+    body = " ".join(body.split())
 
     # Truncate if too long
     if len(body) > max_length:
@@ -31,6 +42,29 @@ def clean_body_text(body: str, max_length: int = 5000) -> str:
     return body.strip()
 
 
+def strip_quoted_reply(body: str, min_length: int = 40) -> str:
+    """
+    Drop the quoted earlier messages from the end of a reply.
+
+    If too little text would be left (e.g. a plain forward, where everything
+    is in the quoted part), the body is returned unchanged.
+
+    Examples:
+        "Please quote 2 pumps. On Mon, Ana wrote: ..." -> "Please quote 2 pumps."
+
+    Args:
+        body: Email body text
+        min_length: Minimum length the kept text must have
+
+    Returns:
+        Body text without the quoted tail
+    """
+    match = QUOTED_REPLY_PATTERN.search(body)
+    if match and match.start() >= min_length:
+        return body[:match.start()].rstrip()
+    return body
+
+
 def extract_email_address(email_str: str) -> str:
     """
     Extract email address from string that may contain name and email.
@@ -49,12 +83,12 @@ def extract_email_address(email_str: str) -> str:
         return ""
 
     # Look for email in angle brackets
-    match = re.search(r'<([^>]+)>', email_str)
+    match = ANGLE_ADDRESS_PATTERN.search(email_str)
     if match:
         return match.group(1).strip()
 
     # Look for email pattern
-    match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', email_str)
+    match = EMAIL_ADDRESS_PATTERN.search(email_str)
     if match:
         return match.group(0).strip()
 
@@ -11,7 +11,11 @@ from pathlib import Path
 
 # Import core components directly
 from extractor import EmailProcessor
-from email_processing import AIProcessor
+from email_processing import AIProcessor, EMAIL_FIELDS
+from utils.console_utils import input_with_timeout
+from utils.date_utils import parse_date
+from config import FAST_IO
+from utils.io_utils import read_table, read_table_layout, resolve_fast_io_path
 
 # Configure logging
 logging.basicConfig(
@@ -21,13 +25,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Smaller .xlsx files can't hold a workbook: an empty one is ~5 KB (about
+# 4.8 KB from openpyxl, 5 KB from xlsxwriter), so this leaves some margin
+MIN_XLSX_SIZE = 4096
+
 class WorkflowOrchestrator:
     """Orchestrates the email extraction and processing workflow."""
 
-    def __init__(self, auto_process=False):
+    def __init__(self, auto_process=False, checkpoint_timeout=300):
         self.auto_process = auto_process
+        # Seconds the checkpoint waits for an answer before stopping (0 = no limit)
+        self.checkpoint_timeout = checkpoint_timeout
         self.extractor_output = "outputs/emails.xlsx"
         self.processor_output = "outputs/emails_processed.xlsx"
+        # Extracted emails kept in memory for the processor, and the mtime of
+        # the file they came from (None when they were never saved)
+        self._extracted_df = None
+        self._extracted_mtime = None
 
     def run_extractor(self, start_date=None, end_date=None):
         """
@@ -46,20 +60,19 @@ class WorkflowOrchestrator:
             # Initialize processor
             processor = EmailProcessor()
             
-            # Convert string dates to datetime objects if needed
-            # Note: EmailProcessor.process_folder expects datetime objects or None
-            # We rely on utils.date_utils.parse_date which is used inside main() of extractor.py
-            # but here we are calling process_folder directly.
-            # Let's import parse_date to be safe
-            from utils.date_utils import parse_date
-            
+            # EmailProcessor.process_folder expects datetime objects or None
             start_dt = parse_date(start_date) if start_date else None
             end_dt = parse_date(end_date) if end_date else None
             
-            success, stats, output_path = processor.process_folder(start_dt, end_dt)
+            # With --auto-process nobody opens the Excel file, so the extracted
+            # emails go straight to the processor instead
+            success, stats, output_path, df = processor.process_folder(
+                start_dt, end_dt, save_output=not self.auto_process
+            )
             
             if success:
                 self.extractor_output = output_path
+                self._extracted_df = df if self.auto_process else None
                 logger.info("✅ Email extraction completed successfully!")
                 return True
             else:
@@ -70,29 +83,60 @@ class WorkflowOrchestrator:
             logger.error(f"❌ Error running extractor: {e}")
             return False
 
-    def check_extractor_output(self):
+    def check_extractor_output(self, keep_data=True):
         """
         Check if extractor output exists and display information.
 
+        Args:
+            keep_data: If True, the table is loaded once and kept for
+                run_processor; otherwise only its header and row count are read
+
         Returns:
             True if output exists and is valid, False otherwise
         """
-        if not os.path.exists(self.extractor_output):
+        if self._extracted_df is not None and self._extracted_mtime is None:
+            logger.info(f"Records extracted: {len(self._extracted_df)} (in memory)")
+            missing = [field for field in EMAIL_FIELDS if field not in self._extracted_df.columns]
+            if missing:
+                logger.error(f"❌ Missing columns in extractor output: {', '.join(missing)}")
+                return False
+            return True
+
+        # One stat call answers existence, size and mtime
+        try:
+            st = os.stat(self.extractor_output)
+        except FileNotFoundError:
             logger.error(f"❌ Extractor output file not found: {self.extractor_output}")
             return False
 
+        if self.extractor_output.lower().endswith('.xlsx') and st.st_size < MIN_XLSX_SIZE:
+            logger.error(f"❌ Extractor output is empty or truncated ({st.st_size} bytes): {self.extractor_output}")
+            return False
+
         try:
-            import pandas as pd
-            df = pd.read_excel(self.extractor_output)
-            record_count = len(df)
+            # Read from the Feather sidecar when it is current (the same file
+            # the processor would read)
+            input_path = resolve_fast_io_path(self.extractor_output) if FAST_IO else self.extractor_output
+            if keep_data:
+                df = read_table(input_path)
+                columns, record_count = list(df.columns), len(df)
+            else:
+                columns, record_count = read_table_layout(input_path)
 
             logger.info(f"Found extractor output: {self.extractor_output}")
             logger.info(f"Records extracted: {record_count}")
 
+            missing = [field for field in EMAIL_FIELDS if field not in columns]
+            if missing:
+                logger.error(f"❌ Missing columns in extractor output: {', '.join(missing)}")
+                return False
+
             if record_count == 0:
                 logger.warning("⚠️  No records found in extractor output!")
                 return False
 
+            if keep_data:
+                self._extracted_df, self._extracted_mtime = df, st.st_mtime
             return True
 
         except Exception as e:
@@ -119,7 +163,18 @@ class WorkflowOrchestrator:
             return True
 
         while True:
-            response = input(f"Continue to processing? (yes/no): ").strip().lower()
+            # Piped answers (echo yes | ...) are read too; a closed stdin with
+            # no answer (cron, CI...) stops the workflow
+            try:
+                response = input_with_timeout("Continue to processing? (yes/no): ", self.checkpoint_timeout)
+            except EOFError:
+                logger.warning("⚠️  No answer on stdin - workflow stopped at checkpoint "
+                               "(use --auto-process for unattended runs)")
+                return False
+            if response is None:
+                logger.warning(f"⚠️  No answer after {self.checkpoint_timeout}s - workflow stopped")
+                return False
+            response = response.strip().lower()
 
             if response in ['yes', 'y']:
                 logger.info("✅ Proceeding to processing step...")
@@ -145,7 +200,8 @@ class WorkflowOrchestrator:
             # We pass the extractor output as input to the processor
             success = processor.process_emails(
                 input_file=self.extractor_output,
-                output_file=self.processor_output
+                output_file=self.processor_output,
+                input_df=self._current_extraction()
             )
 
             if success:
@@ -159,6 +215,27 @@ class WorkflowOrchestrator:
             logger.error(f"❌ Error running processor: {e}")
             return False
 
+    def _current_extraction(self):
+        """
+        Get the extracted emails loaded earlier, unless the file has changed.
+
+        Returns:
+            The kept DataFrame, or None if the processor should read the file
+            (e.g. because it was edited during the checkpoint review)
+        """
+        if self._extracted_df is None or self._extracted_mtime is None:
+            return self._extracted_df
+
+        try:
+            unchanged = os.path.getmtime(self.extractor_output) == self._extracted_mtime
+        except OSError:
+            unchanged = False
+
+        if not unchanged:
+            logger.info("📝 Extractor output changed since it was checked, reloading it")
+            self._extracted_df = self._extracted_mtime = None
+        return self._extracted_df
+
     def run_workflow(self, start_date=None, end_date=None, skip_extraction=False):
         """
         Run the complete workflow.
@@ -200,7 +277,10 @@ class WorkflowOrchestrator:
         print("="*70)
         logger.info("All steps completed successfully!")
         print(f"\nOutput files:")
-        print(f"  📄 Extracted emails: {self.extractor_output}")
+        if self._extracted_df is None or self._extracted_mtime is not None:
+            print(f"  📄 Extracted emails: {self.extractor_output}")
+        else:
+            print("  📄 Extracted emails: not saved (--auto-process)")
         print(f"  📄 Processed emails: {self.processor_output}")
         print()
 
@@ -260,10 +340,22 @@ Examples:
         help='Automatically process without checkpoint confirmation'
     )
 
+    parser.add_argument(
+        '--checkpoint-timeout',
+        type=int,
+        default=300,
+        metavar='SECONDS',
+        help='Stop the workflow if the checkpoint is not answered in time (default: 300, 0 = wait forever)'
+    )
+
     args = parser.parse_args()
 
     # Create orchestrator
-    orchestrator = WorkflowOrchestrator(auto_process=args.auto_process)
+    # Extract-only runs always save the extracted file, it is their only output
+    orchestrator = WorkflowOrchestrator(
+        auto_process=args.auto_process and not args.extract_only,
+        checkpoint_timeout=args.checkpoint_timeout
+    )
 
     # Handle extract-only mode
     if args.extract_only:
@@ -271,7 +363,7 @@ Examples:
         print("EMAIL EXTRACTION ONLY".center(70))
         print("="*70 + "\n")
         if orchestrator.run_extractor(args.start_date, args.end_date):
-            orchestrator.check_extractor_output()
+            orchestrator.check_extractor_output(keep_data=False)
             return 0
         return 1
 